@@ -0,0 +1,55 @@
+# Standard library imports
+import os
+import sys
+from typing import TextIO
+
+
+# ------------ class setup ------------
+class AsciiFrame:
+    """
+    Collects the lines of a frame, then writes the whole frame to the terminal at once.
+    The cursor is moved with ANSI escapes instead of clearing the screen through a shell,
+    and in diff mode only the lines that changed since the previous frame are rewritten.
+    """
+    HOME = "\033[H"
+    CLEAR_SCREEN = "\033[2J"
+    CLEAR_LINE = "\033[K"
+    CLEAR_BELOW = "\033[J"
+
+    def __init__(self, stream: TextIO = sys.stdout, diff: bool = True) -> None:
+        self.stream = stream
+        self.diff = diff
+        self.lines: list[str] = []
+        self.previous_lines: list[str] = []
+
+        # ----- the Windows console only understands the escapes after this (one time) call
+        if os.name == "nt":
+            os.system("")
+
+    def add(self, *lines: str) -> None:
+        self.lines.extend(lines)
+
+    def invalidate(self) -> None:
+        """
+        Forces the next frame to be written in full, e.g. after something else printed to the terminal.
+        """
+        self.previous_lines = []
+
+    def render(self) -> None:
+        lines, previous_lines = self.lines, self.previous_lines
+        if not self.diff or not previous_lines:
+            output = self.CLEAR_SCREEN + self.HOME + "\n".join(lines) + "\n"
+        else:
+            # ----- rewrite the changed lines in place, then wipe everything below the frame
+            parts = [
+                f"\033[{index + 1};1H{line}{self.CLEAR_LINE}"
+                for index, line in enumerate(lines)
+                if index >= len(previous_lines) or previous_lines[index] != line
+            ]
+            parts.append(f"\033[{len(lines) + 1};1H{self.CLEAR_BELOW}")
+            output = "".join(parts)
+
+        self.stream.write(output)
+        self.stream.flush()
+        self.previous_lines = lines
+        self.lines = []
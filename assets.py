@@ -0,0 +1,74 @@
+# Standard library imports
+import os
+
+# Third-party imports
+import pygame
+
+# Local folder imports
+from tile import Tile
+
+
+# ------------ class setup ------------
+class AssetManager:
+    """
+    Loads every image of the images directory at most once per scale.
+    The tile images are packed into a single atlas surface, already scaled to the on-screen size,
+    and handed out as subsurfaces of it, so nothing is loaded or scaled per cell or per frame.
+    Tiles without an image get a placeholder instead of failing.
+    Needs a display mode to be set, as the images are converted to its pixel format.
+    """
+    def __init__(self, directory: str = "images", tile_size: int = 16, scale: int = 2) -> None:
+        self.directory = directory
+        self.tile_size = tile_size
+        self.scale = scale
+
+        self.images: dict[tuple[str, int], pygame.Surface] = {}
+        self.atlas: pygame.Surface | None = None
+        self.tile_images: list[pygame.Surface] = []
+
+    def load(self, name: str, scale: int = 1) -> pygame.Surface:
+        key = (name, scale)
+        image = self.images.get(key)
+        if image is None:
+            path = os.path.join(self.directory, f"{name}.png")
+            if not os.path.exists(path):
+                image = self.placeholder(self.tile_size * scale)
+            elif scale == 1:
+                image = pygame.image.load(path).convert_alpha()
+            else:
+                image = self.scaled(self.load(name), scale)
+            self.images[key] = image
+        return image
+
+    @staticmethod
+    def scaled(image: pygame.Surface, scale: int) -> pygame.Surface:
+        # ----- scale2x keeps the look of the pixel art the game always had, other scales are nearest neighbour
+        if scale == 2:
+            return pygame.transform.scale2x(image)
+        return pygame.transform.scale(image, (image.get_width() * scale, image.get_height() * scale))
+
+    @staticmethod
+    def placeholder(size: int) -> pygame.Surface:
+        image = pygame.Surface((size, size)).convert()
+        image.fill("magenta")
+        half = size // 2
+        image.fill("black", (0, 0, half, half))
+        image.fill("black", (half, half, size - half, size - half))
+        return image
+
+    def build_atlas(self) -> None:
+        """
+        Packs the scaled images of every tile of the palette into one row of the atlas.
+        Cells are always covered by a whole tile, so the atlas is opaque (composed on black, like the map),
+        which makes blitting from it about twice as fast as blitting the per-pixel alpha images.
+        """
+        size = self.tile_size * self.scale
+        self.atlas = pygame.Surface((size * len(Tile.palette), size)).convert()
+        self.atlas.fill("black")
+        self.tile_images = []
+        for tile in Tile.palette:
+            self.atlas.blit(self.load(tile.name, self.scale), (tile.id * size, 0))
+            self.tile_images.append(self.atlas.subsurface(tile.id * size, 0, size, size))
+
+    def tile_image(self, tile: Tile) -> pygame.Surface:
+        return self.tile_images[tile.id]
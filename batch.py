@@ -0,0 +1,108 @@
+# Standard library imports
+import os
+from collections.abc import Iterator
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from math import sqrt
+
+# Local folder imports
+from headless import GameResult, simulate
+
+
+def play_shard(seeds: range, options: dict) -> list[GameResult]:
+    return [simulate(seed, **options) for seed in seeds]
+
+
+def iter_batch(n: int,
+               seed: int = 0,
+               workers: int | None = None,
+               shard_size: int = 64,
+               **options,
+               ) -> Iterator[GameResult]:
+    """
+    Plays n games with the seeds seed, ..., seed + n - 1 on a pool of processes,
+    yielding the results shard by shard as they finish (so not in seed order).
+    Every game only depends on its own seed, so the results don't depend on the number of workers.
+    The options are passed on to simulate and have to be picklable.
+    """
+    shards = [range(start, min(start + shard_size, seed + n)) for start in range(seed, seed + n, shard_size)]
+    if workers == 1:
+        for shard in shards:
+            yield from play_shard(shard, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_shard, shard, options) for shard in shards]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+# ------------ class setup ------------
+class BatchStats:
+    """
+    Running statistics of game results. Only integer sums are kept,
+    so the statistics are the same whatever order the results arrive in.
+    """
+    def __init__(self) -> None:
+        self.games = 0
+        self.survived = 0
+        self.turns = 0
+        self.turns_squared = 0
+        self.kills = 0
+        self.health = 0
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        self.survived += result.survived
+        self.turns += result.turns
+        self.turns_squared += result.turns * result.turns
+        self.kills += result.kills
+        self.health += result.health
+
+    @property
+    def survival_rate(self) -> float:
+        return self.survived / self.games if self.games else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        return self.turns / self.games if self.games else 0.0
+
+    @property
+    def stdev_turns(self) -> float:
+        if self.games < 2:
+            return 0.0
+        variance = (self.turns_squared - self.turns * self.turns / self.games) / (self.games - 1)
+        return sqrt(max(variance, 0.0))
+
+    @property
+    def mean_kills(self) -> float:
+        return self.kills / self.games if self.games else 0.0
+
+    @property
+    def mean_health(self) -> float:
+        return self.health / self.games if self.games else 0.0
+
+    def summary(self) -> str:
+        return (f"games: {self.games}  survival rate: {self.survival_rate:.1%}  "
+                f"turns: {self.mean_turns:.1f} ± {self.stdev_turns:.1f}  "
+                f"kills: {self.mean_kills:.2f}  health left: {self.mean_health:.1f}")
+
+
+def run_batch(n: int,
+              seed: int = 0,
+              workers: int | None = None,
+              on_result=None,
+              **options,
+              ) -> tuple[BatchStats, list[GameResult]]:
+    """
+    Plays n games across all cores (or the given number of workers) and aggregates them.
+    on_result is called with every result as it arrives, the returned results are in seed order.
+    """
+    stats = BatchStats()
+    results = []
+    for result in iter_batch(n, seed, workers or os.cpu_count(), **options):
+        stats.add(result)
+        results.append(result)
+        if on_result:
+            on_result(result)
+    results.sort(key=lambda result: result.seed)
+    return stats, results
@@ -0,0 +1,30 @@
+"""
+Compares spawning enemies from templates against deep copying prototype enemies,
+which is how enemies were spawned before.
+Run from the project root: python -m benchmarks.bench_enemy_spawning
+"""
+# Standard library imports
+from copy import deepcopy
+from random import choice, Random
+from timeit import timeit
+
+# Local folder imports
+from character import enemies
+from spawner import spawn_table
+from tile import forest
+
+NUMBER = 20_000
+
+
+if __name__ == "__main__":
+    prototypes = [template.spawn() for template in enemies]
+    rng = Random(1)
+
+    deepcopy_time = timeit(lambda: deepcopy(choice(prototypes)), number=NUMBER)
+    template_time = timeit(lambda: choice(enemies).spawn(), number=NUMBER)
+    table_time = timeit(lambda: spawn_table.spawn(forest, rng), number=NUMBER)
+
+    for label, total in [("deepcopy(prototype)", deepcopy_time),
+                         ("template.spawn()", template_time),
+                         ("spawn_table.spawn()", table_time)]:
+        print(f"{label:<22} {total / NUMBER * 1_000_000:>7.2f}us per spawn  {deepcopy_time / total:>5.1f}x")
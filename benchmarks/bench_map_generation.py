@@ -0,0 +1,49 @@
+"""
+Compares the map generation against the previous implementation, which filled
+a list of lists of tiles one cell at a time.
+Run from the project root: python -m benchmarks.bench_map_generation
+"""
+# Standard library imports
+from random import Random
+from time import perf_counter
+
+# Local folder imports
+from map import Map, scaled_patch_table
+from tile import plains
+
+SIZES = [(30, 15), (200, 200), (1000, 1000), (2000, 2000)]
+
+
+def legacy_generate(width: int, height: int, seed: int) -> list[list]:
+    rng = Random(seed)
+    map_data = [[plains for _ in range(width)] for _ in range(height)]
+
+    for tile, num_patches, min_size, max_size in scaled_patch_table(width, height):
+        for _ in range(num_patches):
+            size_y = rng.randint(min_size, max_size)
+            start_y = rng.randint(1, height - size_y - 1)
+            raw_start_x = rng.randint(3, width - max_size)
+            for i in range(size_y):
+                size_x = rng.randint(int(0.7 * max_size), max_size)
+                start_x = raw_start_x - rng.randint(1, 2)
+                for j in range(size_x):
+                    map_data[start_y + i][start_x + j] = tile
+    return map_data
+
+
+def best_of(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    print(f"{'size':>12} {'legacy':>10} {'current':>10} {'speedup':>8}")
+    for width, height in SIZES:
+        repeat = 5 if width * height < 1_000_000 else 1
+        legacy = best_of(lambda: legacy_generate(width, height, 1), repeat)
+        current = best_of(lambda: Map(width, height, seed=1), repeat)
+        print(f"{width:>5}x{height:<6} {legacy * 1000:>8.1f}ms {current * 1000:>8.1f}ms {legacy / current:>7.1f}x")
@@ -0,0 +1,29 @@
+"""
+Times the headless replay of a long recorded session, as a repeatable workload to compare versions with.
+Without a path, a session of a random agent with a lot of health is recorded first (and saved for the next runs).
+Run from the project root: python -m benchmarks.bench_replay [recording.json]
+"""
+# Standard library imports
+import os
+import sys
+from timeit import repeat
+
+# Local folder imports
+from replay import record_session, Recording, replay_headless
+
+DEFAULT_PATH = os.path.join("benchmarks", "replay_session.json")
+REPEAT = 5
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    if not os.path.exists(path):
+        record_session(seed=1, health=5000, max_turns=20_000, map_w=120, map_h=60).save(path)
+    recording = Recording.load(path)
+
+    state = replay_headless(recording)
+    print(f"{path}: {len(recording.actions)} actions, ends on turn {state.turn} with {state.kills} kills")
+
+    for label, track_exploration in [("with exploration", True), ("without exploration", False)]:
+        best = min(repeat(lambda: replay_headless(recording, track_exploration), number=1, repeat=REPEAT))
+        print(f"{label:<20} {best * 1000:>8.1f}ms  {len(recording.actions) / best:>9.0f} actions/sec")
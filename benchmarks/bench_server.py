@@ -0,0 +1,127 @@
+"""
+Load test of the game server on localhost: dozens of bot clients send a random move every tick
+and mirror the map from the deltas they get, one more client never reads anything.
+Reports the time a tick takes, the bytes a client gets per tick compared to a whole state,
+whether every mirror matches the server's map, and the buffer the stalled client cost the server.
+Run from the project root: python -m benchmarks.bench_server [clients] [seconds]
+"""
+# Standard library imports
+import asyncio
+import socket
+import sys
+from random import Random
+from statistics import mean
+from time import perf_counter
+
+# Local folder imports
+from client import MapMirror
+from engine import ATTACK, DIRECTIONS
+from map import Map
+from protocol import decode, encode
+from server import GameServer
+
+PORT = 8799
+
+
+async def bot(seed: int, stop: asyncio.Event, received: list[int]) -> MapMirror:
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    mirror, rng = MapMirror(), Random(seed)
+
+    async def send_moves() -> None:
+        while not stop.is_set():
+            action = ATTACK if mirror.state and mirror.state.enemy else rng.choice(list(DIRECTIONS))
+            writer.write(encode({"action": action}))
+            await asyncio.sleep(0.05)
+
+    sender = asyncio.create_task(send_moves())
+    while not stop.is_set():
+        try:
+            line = await asyncio.wait_for(reader.readline(), 0.2)
+        except asyncio.TimeoutError:
+            continue
+        received[0] += len(line)
+        received[1] += 1
+        mirror.apply(decode(line))
+    sender.cancel()
+    writer.close()
+    return mirror
+
+
+async def main(clients: int, seconds: float) -> None:
+    server = GameServer(Map(120, 60, seed=1), tick_rate=20)
+    tick_times = []
+    update = server.update
+
+    def timed_update() -> None:
+        start = perf_counter()
+        update()
+        tick_times.append(perf_counter() - start)
+    server.update = timed_update
+
+    async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # ----- the first connection is the stalled one, small buffers on the server's side too,
+        # otherwise the kernel and the transport would hold minutes of its messages
+        if not server.sessions:
+            writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+            writer.transport.set_write_buffer_limits(high=4096)
+        await server.handle_client(reader, writer)
+
+    tcp_server = await asyncio.start_server(handle_client, "127.0.0.1", PORT)
+    ticks = asyncio.create_task(server.run())
+
+    # ----- a client that floods commands, then never reads: its (small) socket buffer fills up, then its outbox
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(("127.0.0.1", PORT))
+    sock.sendall(b"".join(encode({"action": "right"}) for _ in range(1000)))
+    await asyncio.sleep(0.1)
+    stalled = server.sessions[1]
+    stalled_commands = len(stalled.commands)
+    resyncs = 0
+    send = stalled.send
+
+    def counted_send(line: bytes) -> None:
+        nonlocal resyncs
+        resyncs += len(stalled.outbox) >= stalled.max_messages
+        send(line)
+    stalled.send = counted_send
+
+    stop = asyncio.Event()
+    received = [[0, 0] for _ in range(clients)]
+    bots = [asyncio.create_task(bot(seed, stop, received[seed])) for seed in range(clients)]
+    await asyncio.sleep(seconds)
+    stalled_outbox = len(stalled.outbox)
+    stop.set()
+    mirrors = await asyncio.gather(*bots)
+
+    # ----- every mirror has to show what the server revealed
+    game_map = server.game_map
+    explored = {(x, y) for y in range(game_map.height) for x in range(game_map.width) if game_map.is_explored(x, y)}
+    matching = sum(
+        {(x, y) for y in range(game_map.height) for x in range(game_map.width)
+         if mirror.state.game_map.is_explored(x, y)} == explored
+        and all(mirror.state.game_map.terrain_at(x, y) is game_map.terrain_at(x, y) for x, y in explored)
+        for mirror in mirrors
+    )
+    sync_size = len(server.sync_message(next(iter(server.sessions.values()))))
+
+    # ----- the connections end before the loop does, so the server's handlers finish normally
+    sock.close()
+    await asyncio.sleep(0.2)
+    ticks.cancel()
+    tcp_server.close()
+
+    tick_times.sort()
+    total_bytes, total_lines = sum(size for size, _ in received), sum(lines for _, lines in received)
+    print(f"{clients} clients, {server.tick} ticks in {seconds:.0f}s ({server.tick / seconds:.1f} ticks/sec)")
+    print(f"tick: mean {mean(tick_times) * 1000:.2f}ms  p99 {tick_times[int(len(tick_times) * 0.99)] * 1000:.2f}ms  "
+          f"max {tick_times[-1] * 1000:.2f}ms")
+    print(f"per client: {total_bytes / clients / server.tick:.0f} bytes/tick in {total_lines / clients:.0f} messages, "
+          f"a whole state is {sync_size} bytes")
+    print(f"mirrors matching the server's map: {matching}/{clients}")
+    print(f"stalled client: {stalled_commands} of 1000 commands queued, {stalled_outbox}/{stalled.max_messages} "
+          f"messages buffered at the end, its deltas were dropped for a resync {resyncs} times")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 48, float(sys.argv[2]) if len(sys.argv) > 2 else 5))
@@ -0,0 +1,51 @@
+"""
+Times the startup of every mode in a fresh interpreter: the imports of run.py, then the setup of the game
+up to its first frame (one simulated game for headless). Reports the wall time of the whole process
+(the bare interpreter for comparison), the part spent inside it, and whether pygame got imported.
+Runs on SDL's dummy video driver.
+Run from the project root: python -m benchmarks.bench_startup [runs]
+"""
+# Standard library imports
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+MODES = {
+    "interpreter": "",
+    "headless": "from headless import simulate; simulate(1)",
+    "ascii": "from game import AsciiMode; AsciiMode(seed=1).render()",
+    "pygame": "from pygame_mode import PygameMode; PygameMode(seed=1).render()",
+    "combined": "from pygame_mode import CombinedMode; CombinedMode(seed=1).render()",
+}
+
+# the child prints the time it spent after the interpreter started, and whether pygame was imported
+CHILD = """
+import sys
+from time import perf_counter
+start = perf_counter()
+{imports}
+{setup}
+print(perf_counter() - start, "pygame" in sys.modules, file=sys.stderr)
+"""
+
+
+def start(mode: str) -> tuple[float, float, bool]:
+    code = CHILD.format(imports="import run" if MODES[mode] else "", setup=MODES[mode])
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    begin = perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    wall = perf_counter() - begin
+    inside, pygame_loaded = result.stderr.split()[-2:]
+    return wall, float(inside), pygame_loaded == "True"
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'mode':<12} {'process':>10} {'after start':>12}  pygame")
+    for mode in MODES:
+        results = [start(mode) for _ in range(runs)]
+        wall = median(wall for wall, _, _ in results)
+        inside = median(inside for _, inside, _ in results)
+        print(f"{mode:<12} {wall * 1000:>8.1f}ms {inside * 1000:>10.1f}ms  {'yes' if results[0][2] else 'no'}")
@@ -0,0 +1,315 @@
+"""
+Benchmark suite of the hot paths: map generation, exploring, ascii rendering, pygame frames, text, spawning,
+pathfinding and roaming enemies.
+Every case reports ops/sec, timing percentiles and allocations (tracemalloc). Results can be written as JSON
+and compared against a stored baseline, a case slower than the threshold counts as a regression (exit code 1).
+Runs headless on SDL's dummy video driver.
+Run from the project root: python -m benchmarks.suite [--filter map] [--json results.json] [--baseline base.json]
+"""
+# Standard library imports
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from contextlib import redirect_stdout
+from random import Random
+from statistics import mean
+from time import perf_counter_ns
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Local folder imports
+from character import Player
+from engine import ATTACK, GameState, LEFT, RIGHT, step
+from pygame_mode import PygameMode
+from map import Map
+from pathfinding import Pathfinder
+from population import EnemyPopulation
+from spawner import spawn_table
+from tile import forest
+from world import World
+
+CASES = {}
+
+
+def case(name: str):
+    """
+    Registers a benchmark case: a function doing the setup, returning the operation to time.
+    """
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def walker(game_map: Map, player: Player):
+    """
+    Returns a function moving the player one step along a loop around the map on every call.
+    """
+    path = ([(x, 2) for x in range(2, game_map.width - 2)]
+            + [(game_map.width - 3, y) for y in range(2, game_map.height - 2)]
+            + [(x, game_map.height - 3) for x in range(game_map.width - 3, 1, -1)]
+            + [(2, y) for y in range(game_map.height - 3, 1, -1)])
+    index = 0
+
+    def walk() -> None:
+        nonlocal index
+        index = (index + 1) % len(path)
+        player.pos = list(path[index])
+    return walk
+
+
+# ------------ map generation ------------
+for map_w, map_h in [(30, 15), (120, 60), (480, 240)]:
+    case(f"map_init[{map_w}x{map_h}]")(lambda map_w=map_w, map_h=map_h: lambda: Map(map_w, map_h, seed=1))
+
+
+@case("generate_patch[120x60]")
+def generate_patch():
+    game_map = Map(120, 60, seed=1)
+    return lambda: game_map.generate_patch(forest, 3, 3, 7)
+
+
+# ------------ exploring ------------
+@case("update_map[120x60]")
+def update_map():
+    game_map, player = Map(120, 60, seed=1), Player()
+    walk = walker(game_map, player)
+
+    def step() -> None:
+        walk()
+        game_map.update_map(player.pos, player.marker)
+    return step
+
+
+@case("reveal_map[120x60]")
+def reveal_map():
+    game_map, player = Map(120, 60, seed=1), Player()
+    walk = walker(game_map, player)
+
+    def step() -> None:
+        walk()
+        game_map.reveal_map(player.pos)
+    return step
+
+
+# ------------ ascii rendering ------------
+@case("display_map[30x15 view]")
+def display_map():
+    game_map, player = Map(120, 60, seed=1), Player()
+    for x in range(0, 120, 3):
+        for y in range(0, 60, 3):
+            game_map.reveal_map([x, y])
+    game_map.update_map([60, 30], player.marker)
+    output = io.StringIO()
+
+    def display() -> None:
+        output.seek(0)
+        output.truncate()
+        with redirect_stdout(output):
+            game_map.display_map((45, 22, 30, 15))
+    return display
+
+
+# ------------ pygame rendering ------------
+def pygame_game() -> PygameMode:
+    game = PygameMode(120, 60, seed=1)
+    game.frame_scheduler.redraw_on_change = False
+    return game
+
+
+@case("pygame_display")
+def pygame_display():
+    game = pygame_game()
+    walk = walker(game.game_map, game.player)
+
+    def frame() -> None:
+        walk()
+        game.game_map.update_map(game.player.pos, game.player.marker)
+        game.display()
+        game.dirty_rects.clear()
+    return frame
+
+
+@case("pygame_display_ui")
+def pygame_display_ui():
+    game = pygame_game()
+
+    def frame() -> None:
+        game.display_ui()
+        game.dirty_rects.clear()
+    return frame
+
+
+@case("draw_text")
+def draw_text():
+    game = pygame_game()
+    texts = [f"Health: {health}" for health in range(100)]
+    index = 0
+
+    def draw() -> None:
+        nonlocal index
+        index = (index + 1) % len(texts)
+        game.draw_text(texts[index], (100, 100))
+    return draw
+
+
+# ------------ spawning ------------
+@case("spawn_enemy")
+def spawn_enemy():
+    game = pygame_game()
+    game.state.spawn_chance = 100
+    return lambda: game.spawn_enemy(game.player.pos)
+
+
+@case("spawn_table.spawn")
+def spawn_table_spawn():
+    return lambda: spawn_table.spawn(forest)
+
+
+# ------------ pathfinding ------------
+@case("find_path[120x60]")
+def find_path():
+    pathfinder = Pathfinder(Map(120, 60, seed=1))
+    return lambda: pathfinder.find_path((1, 1), (118, 58))
+
+
+@case("distance_field[120x60]")
+def distance_field():
+    pathfinder = Pathfinder(Map(120, 60, seed=1))
+    return lambda: pathfinder.compute_field([(118, 58)], (0, 0, 120, 60))
+
+
+# ------------ roaming enemies ------------
+def crowded_world(enemies_per_region: int) -> GameState:
+    """
+    Returns the state of a game on an endless world with the given population density around the player,
+    and a few hundred populated regions far away, which must not slow down a turn (about 60k enemies in all).
+    """
+    game_map = World(30, 15, seed=1)
+    population = EnemyPopulation(game_map, spawn_table, 1, Random(1), density=enemies_per_region / 32 ** 2)
+    for region in range(100):
+        population.activate([10_000 + region * 64, 10_000])
+    player = Player(health=10 ** 9)
+    return GameState(game_map, player, Random(1), track_exploration=False, population=population)
+
+
+@case("turn[60k enemies]")
+def turn():
+    state = crowded_world(200)
+    actions = [RIGHT] * 20 + [LEFT] * 20
+    index = 0
+
+    def play() -> None:
+        nonlocal index
+        index = (index + 1) % len(actions)
+        step(state, ATTACK if state.enemy else actions[index])
+    return play
+
+
+@case("spatial_hash.near[60k enemies]")
+def spatial_hash_near():
+    population = crowded_world(200).population
+    return lambda: sum(1 for _ in population.index.near(0, 0, 16))
+
+
+@case("linear_scan.near[60k enemies]")
+def linear_scan_near():
+    positions = crowded_world(200).population.index.positions
+    return lambda: sum(1 for x, y in positions.values() if abs(x) <= 16 and abs(y) <= 16)
+
+
+def percentile(sorted_values: list[int], fraction: float) -> float:
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def measure(operation, min_time_ns: int = 200_000_000, max_samples: int = 100_000, warmup: int = 10) -> dict:
+    for _ in range(warmup):
+        operation()
+
+    # ----- timing, one sample per operation
+    samples = []
+    total = 0
+    while total < min_time_ns and len(samples) < max_samples:
+        start = perf_counter_ns()
+        operation()
+        elapsed = perf_counter_ns() - start
+        samples.append(elapsed)
+        total += elapsed
+    samples.sort()
+
+    # ----- allocations, measured separately as tracing slows everything down
+    runs = min(len(samples), 1000)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(runs):
+        operation()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "samples": len(samples),
+        "ops_per_sec": 1e9 / percentile(samples, 0.5),  # the median is less noisy than the mean
+        "mean_us": mean(samples) / 1000,
+        "p50_us": percentile(samples, 0.5) / 1000,
+        "p90_us": percentile(samples, 0.9) / 1000,
+        "p99_us": percentile(samples, 0.99) / 1000,
+        "peak_kb": (peak - before) / 1024,
+        "retained_bytes_per_op": (after - before) / runs,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns the cases whose ops/sec dropped by more than the threshold (a fraction) against the baseline.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        change = result["ops_per_sec"] / baseline[name]["ops_per_sec"] - 1
+        result["change"] = change
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the hot paths of the game")
+    parser.add_argument("--filter", default="", help="only run the cases containing this text")
+    parser.add_argument("--time", type=float, default=0.2, help="seconds of timing per case")
+    parser.add_argument("--json", default=None, metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--baseline", default=None, metavar="PATH", help="compare against results written by --json")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown counted as a regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<32} {'ops/sec':>11} {'p50':>10} {'p90':>10} {'p99':>10} {'peak':>9} {'retained':>10}")
+    for name, setup in CASES.items():
+        if args.filter not in name:
+            continue
+        result = results[name] = measure(setup(), int(args.time * 1e9))
+        print(f"{name:<32} {result['ops_per_sec']:>11.0f} {result['p50_us']:>8.1f}us {result['p90_us']:>8.1f}us "
+              f"{result['p99_us']:>8.1f}us {result['peak_kb']:>7.1f}kb {result['retained_bytes_per_op']:>8.1f}b")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        print(f"\ncompared to {args.baseline}:")
+        for name, result in results.items():
+            if "change" in result:
+                flag = "  REGRESSION" if name in regressions else ""
+                print(f"{name:<32} {result['change']:>+8.1%}{flag}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": results},
+                      file, indent=2)
+
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,46 @@
+# Standard library imports
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Local folder imports
+    from map import Map
+
+
+# ------------ class setup ------------
+class Camera:
+    """
+    A fixed width x height window of the map following the player.
+    The window only scrolls once the player gets closer than `margin` cells to its edge,
+    so most moves keep the view in place, and it never shows beyond the edge of a bounded map.
+    """
+    def __init__(self, width: int, height: int, game_map: "Map", margin: int = 4) -> None:
+        self.width = width
+        self.height = height
+        self.game_map = game_map
+        self.margin_x = min(margin, (width - 1) // 2)
+        self.margin_y = min(margin, (height - 1) // 2)
+
+        self.x = 0
+        self.y = 0
+
+    @property
+    def view(self) -> tuple[int, int, int, int]:
+        return self.x, self.y, self.width, self.height
+
+    def follow(self, pos: list[int]) -> tuple[int, int, int, int]:
+        x, y = pos
+        # ----- scroll just enough to keep the target inside the margins
+        if x < self.x + self.margin_x:
+            self.x = x - self.margin_x
+        elif x >= self.x + self.width - self.margin_x:
+            self.x = x - self.width + self.margin_x + 1
+        if y < self.y + self.margin_y:
+            self.y = y - self.margin_y
+        elif y >= self.y + self.height - self.margin_y:
+            self.y = y - self.height + self.margin_y + 1
+
+        self.x, self.y = self.game_map.clamp_view(self.x, self.y, self.width, self.height)
+        return self.view
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
@@ -1,45 +1,60 @@
 # Standard library imports
-import msvcrt
+from typing import NamedTuple, TYPE_CHECKING
 
 # Local folder imports
 from health_bar import HealthBar
 from tile import player_marker
-from weapon import fists, claws, jaws, short_bow
+from weapon import fists, claws, jaws, short_bow, Weapon
 
+# speed of the player, faster characters act more often (see scheduler.py)
+NORMAL_SPEED = 100
 
-INSTANT_INPUT = False
+if TYPE_CHECKING:
+    # Local folder imports
+    from input_backend import InputBackend
+    from map import Map
 
 
 # ------------ parent class setup ------------
 class Character:
+    __slots__ = ("name", "health", "health_max", "speed", "weapon", "health_bar")
+
     def __init__(self,
                  name: str,
                  health: int,
+                 speed: int = NORMAL_SPEED,
                  ) -> None:
         self.name = name
         self.health = health
         self.health_max = health
+        self.speed = speed
 
         self.weapon = fists
 
-    def attack(self, target) -> None:
+    def attack(self, target) -> int | None:
+        """
+        Returns the damage dealt, or None if the attacker is already dead.
+        """
         if self.health <= 0:
-            return
+            return None
         target.health -= self.weapon.damage
         target.health = max(target.health, 0)
         target.health_bar.update()
-        print(f"{self.name} dealt {self.weapon.damage} damage to "
-              f"{target.name} with {self.weapon.name}")
+        return self.weapon.damage
 
     def __copy__(self):
         new_instance = self.__class__.__new__(self.__class__)
-        new_instance.__dict__.update(self.__dict__)
-        # Add any additional attributes that need to be copied
+        for cls in self.__class__.__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(self, slot):
+                    setattr(new_instance, slot, getattr(self, slot))
         return new_instance
 
 
 # ------------ subclass setup ------------
 class Player(Character):
+    __slots__ = ("default_weapon", "pos", "marker", "movement_options")
+
     def __init__(self, name: str = "Player", health: int = 100) -> None:
         super().__init__(name=name, health=health)
 
@@ -62,44 +77,67 @@ class Player(Character):
         self.pos[0] += x
         self.pos[1] += y
 
-    def calculate_movement_options(self, width, height) -> None:
+    def calculate_movement_options(self, game_map: "Map") -> None:
+        x, y = self.pos
         self.movement_options = {
-            "up": self.pos[1] > 0,  # can go up
-            "down": self.pos[1] < height - 1,  # can go down
-            "left": self.pos[0] > 0,  # can go left
-            "right": self.pos[0] < width - 1  # can go right
+            "up": game_map.in_bounds(x, y - 1),  # can go up
+            "down": game_map.in_bounds(x, y + 1),  # can go down
+            "left": game_map.in_bounds(x - 1, y),  # can go left
+            "right": game_map.in_bounds(x + 1, y)  # can go right
         }
 
-    def get_movement_input(self) -> None:
-        choice = msvcrt.getch().decode('utf-8') if INSTANT_INPUT else input()
+    def get_movement_input(self, input_backend: "InputBackend", timeout: float | None = None) -> str | None:
+        """
+        Waits at most timeout seconds (None waits forever) for a key.
+        Returns the direction to move to, if the key is one of the available directions.
+        """
+        choice = input_backend.poll(timeout)
 
         if self.movement_options["up"] and choice in ("w", "W"):
-            self.pos[1] -= 1
+            return "up"
         elif self.movement_options["down"] and choice in ("s", "S"):
-            self.pos[1] += 1
+            return "down"
         elif self.movement_options["left"] and choice in ("a", "A"):
-            self.pos[0] -= 1
+            return "left"
         elif self.movement_options["right"] and choice in ("d", "D"):
-            self.pos[0] += 1
+            return "right"
+        return None
 
 
 # ------------ subclass setup ------------
 class Enemy(Character):
+    __slots__ = ("pos",)
+
     def __init__(self,
                  name: str,
                  health: int,
                  weapon=None,
+                 speed: int = NORMAL_SPEED,
                  ) -> None:
-        super().__init__(name=name, health=health)
+        super().__init__(name=name, health=health, speed=speed)
         self.weapon = weapon
+        self.pos: list[int] | None = None  # only enemies living on the map have a position (see population.py)
 
         self.health_bar = HealthBar(self, color="red")
 
-        enemies.append(self)
+
+# ------------ template setup ------------
+class EnemyTemplate(NamedTuple):
+    """
+    The stats an enemy is created from, the weapon is shared by every enemy of the template.
+    """
+    name: str
+    health: int
+    weapon: Weapon
+    speed: int = NORMAL_SPEED
+
+    def spawn(self) -> Enemy:
+        return Enemy(self.name, self.health, self.weapon, self.speed)
 
 
-enemies = []
-slime = Enemy("Slime", 10, jaws)
-goblin = Enemy("Goblin", 20, short_bow)
-spider = Enemy("Spider", 15, jaws)
-rat = Enemy("Rat", 6, claws)
+slime = EnemyTemplate("Slime", 10, jaws, speed=60)
+goblin = EnemyTemplate("Goblin", 20, short_bow)
+spider = EnemyTemplate("Spider", 15, jaws, speed=120)
+rat = EnemyTemplate("Rat", 6, claws, speed=150)
+enemies = [slime, goblin, spider, rat]
+enemy_templates = {template.name: template for template in enemies}
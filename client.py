@@ -0,0 +1,164 @@
+# Standard library imports
+import asyncio
+from random import Random
+
+# Local folder imports
+from character import Enemy, Player
+from engine import ATTACK, GameState
+from game import AsciiMode
+from input_backend import ENTER_KEYS, TerminalInput
+from map import Map
+from protocol import decode, encode, PORT, SYNC
+from replay import CODE_ACTIONS
+from tile import ally_marker, Tile
+
+
+# ------------ class setup ------------
+class MapMirror:
+    """
+    The client's copy of the shared map and the players, kept up to date with the messages of the server.
+    The state is a regular game state, so the existing frontends draw it, but the game logic never runs on it.
+    """
+    def __init__(self) -> None:
+        self.player_id = ""
+        self.state: GameState | None = None
+        self.palette: list[Tile] = []
+        self.others: dict[str, tuple[int, int]] = {}
+
+    def apply(self, message: dict) -> bool:
+        """
+        Applies a message of the server, returns whether it replaced the state (a sync).
+        """
+        synced = message["type"] == SYNC
+        if synced:
+            self.player_id = str(message["id"])
+            tiles = {tile.name: tile for tile in Tile.palette}
+            self.palette = [tiles.get(name, Tile.palette[0]) for name in message["palette"]]
+            game_map = Map(message["width"], message["height"], seed=0, generate=False)
+            self.state = GameState(game_map, Player(f"Player {self.player_id}"), Random(), track_exploration=False)
+            self.others = {}
+
+        state = self.state
+        game_map, player = state.game_map, state.player
+        for x, y, tile_id in message.get("cells", ()):
+            tile = self.palette[tile_id]
+            game_map.set_terrain(x, y, tile)
+            game_map.explore(x, y)
+            game_map.explored_tiles.setdefault(tile)
+
+        for player_id in map(str, message.get("left", ())):
+            if pos := self.others.pop(player_id, None):
+                game_map.clear_overlay(pos, ally_marker)
+        for player_id, (x, y, health, health_max) in message.get("players", {}).items():
+            if player_id == self.player_id:
+                player.pos = [x, y]
+                player.health, player.health_max = health, health_max
+                player.health_bar.update()
+                game_map.place_marker(player.pos, player.marker)
+            else:
+                if pos := self.others.get(player_id):
+                    game_map.clear_overlay(pos, ally_marker)
+                self.others[player_id] = (x, y)
+        # ----- other players are drawn where the player isn't, even if one of them just left the player's cell
+        for pos in self.others.values():
+            game_map.set_overlay(pos, ally_marker)
+        if self.others:
+            game_map.explored_tiles.setdefault(ally_marker)
+
+        you = message.get("you", {})
+        if "enemy" in you:
+            if you["enemy"] is None:
+                state.enemy = None
+            else:
+                name, health, health_max = you["enemy"]
+                if state.enemy is None or state.enemy.name != name:
+                    state.enemy = Enemy(name, health_max)
+                state.enemy.health = health
+                state.enemy.health_bar.update()
+        player.calculate_movement_options(game_map)
+        return synced
+
+
+# ------------ class setup ------------
+class RemoteFrontend:
+    """
+    Turns a frontend into a thin client: it draws the mirrored state, and the actions it would apply
+    (from keys, clicks or travels) are sent to the server instead.
+    """
+    writer: asyncio.StreamWriter | None = None
+
+    def apply(self, action: str) -> list:
+        if self.writer is not None and not self.writer.is_closing():
+            self.writer.write(encode({"action": action}))
+        return []
+
+
+# ------------ remote ascii mode setup ------------
+class RemoteAsciiMode(RemoteFrontend, AsciiMode):
+    def input_action(self, key: str) -> str | None:
+        if self.state.enemy:
+            return ATTACK if key in ENTER_KEYS else None
+        action = CODE_ACTIONS.get(key[:1].lower())
+        return action if self.player.movement_options.get(action) else None
+
+
+async def receive(game: RemoteFrontend, mirror: MapMirror, reader: asyncio.StreamReader) -> None:
+    while line := await reader.readline():
+        message = decode(line)
+        if mirror.apply(message):
+            game.restore(mirror.state)
+        if isinstance(game, AsciiMode):
+            game.render()
+        else:
+            game.frame_scheduler.request_redraw()
+        for text in message.get("you", {}).get("events", ()):
+            print(text)
+
+
+async def run_ascii(game: RemoteAsciiMode) -> None:
+    # ----- the terminal is read in a thread, so the messages of the server are drawn while waiting for a key,
+    # the short timeout lets the thread end soon after the game does
+    loop = asyncio.get_running_loop()
+    input_backend = TerminalInput()
+    while True:
+        key = await loop.run_in_executor(None, input_backend.poll, 0.2)
+        if key is None:
+            continue
+        if key.strip().lower() == "q":
+            return
+        if action := game.input_action(key.strip()):
+            game.apply(action)
+
+
+async def connect(host: str = "127.0.0.1", port: int = PORT, mode: str = "ascii") -> None:
+    """
+    Plays on a server (see server.py) in the ascii or pygame frontend, until the connection ends (or Q in ascii).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    if mode == "ascii":
+        game, run_frontend = RemoteAsciiMode(), run_ascii
+    else:
+        # ----- pygame is only imported by its frontend, so the ascii client starts without it
+        from client_pygame import RemotePygameMode, run_pygame
+        game, run_frontend = RemotePygameMode(), run_pygame
+    game.writer = writer
+
+    # ----- the frontend starts once the state of the server arrived, which is always the first message
+    line = await reader.readline()
+    if not line:
+        writer.close()
+        return
+    mirror = MapMirror()
+    mirror.apply(decode(line))
+    game.restore(mirror.state)
+    if isinstance(game, AsciiMode):
+        game.render()
+
+    receive_task = asyncio.create_task(receive(game, mirror, reader))
+    frontend_task = asyncio.create_task(run_frontend(game))
+    try:
+        await asyncio.wait([receive_task, frontend_task], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        receive_task.cancel()
+        frontend_task.cancel()
+        writer.close()
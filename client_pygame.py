@@ -0,0 +1,23 @@
+# Standard library imports
+import asyncio
+
+# Local folder imports
+from client import RemoteFrontend
+from pygame_mode import PygameMode
+
+
+# ------------ remote pygame mode setup ------------
+class RemotePygameMode(RemoteFrontend, PygameMode):
+    pass
+
+
+async def run_pygame(game: RemotePygameMode) -> None:
+    # ----- the loop sleeps between frames instead of pygame, so the messages of the server are received meanwhile,
+    # frames are only drawn when something changed (a key, or a message, see receive)
+    frame_scheduler = game.frame_scheduler
+    frame_scheduler.sleeps = False
+    while True:
+        game.check_events()
+        if frame_scheduler.needs_redraw:
+            game.render()
+        await asyncio.sleep(1 / frame_scheduler.target_fps)
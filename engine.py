@@ -0,0 +1,240 @@
+# Standard library imports
+from random import Random
+from typing import NamedTuple
+
+# Local folder imports
+from character import Character, Enemy, NORMAL_SPEED, Player
+from map import Map
+from pathfinding import Pathfinder
+from population import EnemyPopulation
+from rng import RngStreams
+from scheduler import TurnScheduler
+from spawner import spawn_table, SpawnTable
+
+SPAWN_CHANCE = 10
+
+# time moving takes at normal speed, attacking takes the cost of the weapon (see weapon.py)
+MOVE_COST = 100
+
+# ------------ actions ------------
+UP = "up"
+DOWN = "down"
+LEFT = "left"
+RIGHT = "right"
+ATTACK = "attack"
+DIRECTIONS = {UP: (0, -1), DOWN: (0, 1), LEFT: (-1, 0), RIGHT: (1, 0)}
+ACTIONS = (UP, DOWN, LEFT, RIGHT, ATTACK)
+
+# ------------ event kinds ------------
+MOVED = "moved"
+BLOCKED = "blocked"
+ENCOUNTER = "encounter"
+ATTACKED = "attacked"
+DEFEATED = "defeated"
+PLAYER_DIED = "player_died"
+
+
+# ------------ class setup ------------
+class Event(NamedTuple):
+    kind: str
+    actor: str = ""
+    target: str = ""
+    amount: int = 0
+    detail: str = ""
+
+    def describe(self) -> str | None:
+        """
+        Returns the line the terminal frontends print for the event, if any.
+        """
+        if self.kind == ATTACKED:
+            return f"{self.actor} dealt {self.amount} damage to {self.target} with {self.detail}"
+        return None
+
+
+# ------------ class setup ------------
+class GameState:
+    """
+    Everything the game logic works on: the map, the player, the enemy in combat and the rng.
+    Exploration tracking (revealing the map) can be turned off for headless runs that don't need it.
+    With a population, enemies roam the map and are met there, instead of being rolled on every move.
+    The scheduler orders the actions of the player and the enemies by time. Between steps it's the player's turn,
+    so the player is only scheduled while the enemies act.
+    """
+    def __init__(self,
+                 game_map: Map,
+                 player: Player,
+                 rng: Random,
+                 spawn_chance: int | None = None,
+                 spawn_table: SpawnTable = spawn_table,
+                 track_exploration: bool = True,
+                 population: EnemyPopulation | None = None,
+                 scheduler: TurnScheduler | None = None,
+                 ) -> None:
+        self.game_map = game_map
+        self.player = player
+        self.rng = rng
+        self.spawn_chance = SPAWN_CHANCE if spawn_chance is None else spawn_chance
+        self.spawn_table = spawn_table
+        self.track_exploration = track_exploration
+        self.population = population
+        self.scheduler = TurnScheduler() if scheduler is None else scheduler
+        self.pathfinder = population.pathfinder if population is not None else Pathfinder(game_map)
+
+        self.enemy: Enemy | None = None
+        self.turn = 0
+        self.kills = 0
+
+        self.update_surroundings()
+
+    @property
+    def game_over(self) -> bool:
+        return self.player.health <= 0
+
+    def update_surroundings(self) -> None:
+        self.player.calculate_movement_options(self.game_map)
+        if self.population is not None:
+            self.population.activate(self.player.pos)
+            self.wake_enemies()
+        if self.track_exploration:
+            self.game_map.update_map(self.player.pos, self.player.marker)
+            if self.population is not None:
+                self.population.update_view(self.game_map.visible_cells, self.player.pos)
+
+    def wake_enemies(self) -> None:
+        """
+        Schedules the enemies that came within the activity radius, each after a random part of a move,
+        so they don't all act at once.
+        """
+        population, scheduler = self.population, self.scheduler
+        for enemy in population.entering(self.player.pos):
+            if enemy not in scheduler:
+                scheduler.schedule(enemy, 1 + population.rng.randrange(action_delay(enemy, MOVE_COST)))
+
+
+def action_delay(character: Character, cost: int) -> int:
+    """
+    Returns the ticks an action of the given cost takes the character.
+    """
+    return max(1, cost * NORMAL_SPEED // character.speed)
+
+
+def new_game_state(game_map: Map,
+                   player: Player,
+                   rng: RngStreams,
+                   spawn_chance: int | None = None,
+                   spawn_table: SpawnTable = spawn_table,
+                   roaming: bool = False,
+                   track_exploration: bool = True,
+                   ) -> GameState:
+    """
+    Creates the state of a new game, with every subsystem drawing from its own stream of the rng.
+    """
+    population = EnemyPopulation(game_map, spawn_table, rng.seed, rng.stream("population")) if roaming else None
+    return GameState(game_map, player, rng.stream("spawn"), spawn_chance, spawn_table, track_exploration, population)
+
+
+def travel_actions(path: list[tuple[int, int]]) -> list[str]:
+    """
+    Returns the moves walking along the path (e.g. of Pathfinder.find_path), which starts at the player.
+    """
+    actions_by_step = {step: action for action, step in DIRECTIONS.items()}
+    return [actions_by_step[x - previous_x, y - previous_y] for (previous_x, previous_y), (x, y) in zip(path, path[1:])]
+
+
+def spawn_enemy(state: GameState, pos: list[int]) -> Enemy | None:
+    x, y = pos
+    chance = state.rng.randint(1, 100)
+    if chance < state.spawn_chance:
+        return state.spawn_table.spawn(state.game_map.terrain_at(x, y), state.rng)
+    return None
+
+
+def attack(state: GameState, attacker: Character, target: Character, events: list[Event]) -> None:
+    damage = attacker.attack(target)
+    if damage is not None:
+        events.append(Event(ATTACKED, attacker.name, target.name, damage, attacker.weapon.name))
+    if target.health > 0:
+        return
+
+    # ----- the combat is over if either of the combatants died
+    state.enemy = None
+    if target is state.player:
+        events.append(Event(PLAYER_DIED, attacker.name, target.name))
+        return
+    state.kills += 1
+    events.append(Event(DEFEATED, attacker.name, target.name))
+    state.scheduler.remove(target)
+    if state.population is not None:
+        state.population.remove(target)
+
+
+def step(state: GameState, action: str) -> tuple[GameState, list[Event]]:
+    """
+    Applies one action of the player, then lets the enemies act until it's the player's turn again.
+    Returns the state with the events that happened.
+    The state is updated in place, as copying the map every step would defeat the purpose.
+    No input or output happens here, the frontends turn input into actions and events into output.
+    """
+    events = []
+    if state.game_over:
+        return state, events
+    player = state.player
+
+    # ----- in combat, attacking is the only possible action
+    if state.enemy:
+        if action != ATTACK:
+            events.append(Event(BLOCKED, player.name, detail=action))
+            return state, events
+        attack(state, player, state.enemy, events)
+        cost = player.weapon.attack_cost
+
+    # ----- otherwise the player moves to one of the available directions, which may spawn an enemy
+    else:
+        if action not in DIRECTIONS or not player.movement_options.get(action):
+            events.append(Event(BLOCKED, player.name, detail=action))
+            return state, events
+        player.move(*DIRECTIONS[action])
+        events.append(Event(MOVED, player.name, detail=action))
+        if state.population is not None:
+            # ----- the player meets the enemy living on the cell
+            state.enemy = state.population.enemy_at(*player.pos)
+        elif enemy := spawn_enemy(state, player.pos):
+            state.enemy = enemy
+            state.scheduler.schedule(enemy, action_delay(enemy, enemy.weapon.attack_cost))
+        if state.enemy:
+            events.append(Event(ENCOUNTER, player.name, state.enemy.name))
+        cost = MOVE_COST
+
+    # ----- only applied actions take a turn, blocked ones change nothing
+    state.turn += 1
+    state.scheduler.schedule(player, action_delay(player, cost))
+    run_enemies(state, events)
+    state.update_surroundings()
+    return state, events
+
+
+def run_enemies(state: GameState, events: list[Event]) -> None:
+    """
+    Lets the scheduled enemies act in order until it's the player's turn:
+    the enemy in combat attacks, the others roam, or fall asleep once out of the activity radius of the player.
+    """
+    scheduler, player, population = state.scheduler, state.player, state.population
+    while not state.game_over:
+        enemy = scheduler.pop()
+        if enemy is player or enemy is None:
+            return
+        if enemy is state.enemy:
+            attack(state, enemy, player, events)
+            if state.game_over:
+                # ----- the killer isn't scheduled again, it may not be part of the population to be saved with
+                return
+            cost = enemy.weapon.attack_cost
+        elif population is None or not population.near_player(enemy, player.pos):
+            continue
+        else:
+            # ----- an enemy stepping onto the player starts a combat, unless the player is in one already
+            if population.wander(enemy, player.pos, in_combat=state.enemy is not None):
+                state.enemy = enemy
+                events.append(Event(ENCOUNTER, player.name, enemy.name))
+            cost = MOVE_COST
+        scheduler.schedule(enemy, action_delay(enemy, cost))
@@ -0,0 +1,67 @@
+# Standard library imports
+from typing import TYPE_CHECKING
+
+# Local folder imports
+from tile import Tile
+
+if TYPE_CHECKING:
+    # Local folder imports
+    from map import Map
+
+
+def line_between(dx: int, dy: int) -> list[tuple[int, int]]:
+    """
+    Returns the cells strictly between the origin and (dx, dy) on a Bresenham line.
+    """
+    cells = []
+    steps = max(abs(dx), abs(dy))
+    for step in range(1, steps):
+        cells.append((round(dx * step / steps), round(dy * step / steps)))
+    return cells
+
+
+# ------------ class setup ------------
+class FieldOfView:
+    """
+    Visibility stencil precomputed once per radius and shape:
+    every offset within sight of the viewer, with the cells its line of sight passes through.
+    Shapes are "circle" (the 5x5 with cut corners for radius 2), "diamond" and "square".
+    """
+    def __init__(self, radius: int = 2, shape: str = "circle") -> None:
+        self.radius = radius
+        self.shape = shape
+
+        self.stencil: list[tuple[int, int, list[tuple[int, int]]]] = []
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                if self.in_shape(dx, dy):
+                    self.stencil.append((dx, dy, line_between(dx, dy)))
+
+    def in_shape(self, dx: int, dy: int) -> bool:
+        if self.shape == "square":
+            return True
+        if self.shape == "diamond":
+            return abs(dx) + abs(dy) <= self.radius
+        return dx * dx + dy * dy <= self.radius * (self.radius + 1)
+
+    def visible_cells(self, game_map: "Map", pos: list[int]) -> list[tuple[int, int]]:
+        """
+        Returns the cells seen from pos. Tiles blocking sight (e.g. mountains) are seen,
+        but hide whatever is behind them.
+        """
+        x, y = pos
+        x_start, y_start, x_end, y_end = game_map.clip(x - self.radius, y - self.radius,
+                                                       x + self.radius + 1, y + self.radius + 1)
+        # ----- the stencil is read as row slices of the terrain, clipped to the map
+        rows = {row_y: game_map.terrain_row(row_y, x_start, x_end) for row_y in range(y_start, y_end)}
+        blocking = Tile.blocking_ids
+
+        visible = []
+        for dx, dy, line in self.stencil:
+            cell_x, cell_y = x + dx, y + dy
+            if not (x_start <= cell_x < x_end and y_start <= cell_y < y_end):
+                continue
+            if blocking and any(rows[y + line_y][x + line_x - x_start] in blocking for line_x, line_y in line):
+                continue
+            visible.append((cell_x, cell_y))
+        return visible
@@ -0,0 +1,55 @@
+# Standard library imports
+from time import perf_counter
+
+# Third-party imports
+import pygame
+
+
+# ------------ class setup ------------
+class FrameScheduler:
+    def __init__(self,
+                 target_fps: int = 60,
+                 redraw_on_change: bool = True,
+                 idle_timeout: int = 1000,
+                 ) -> None:
+        self.target_fps = target_fps
+        self.redraw_on_change = redraw_on_change
+        self.idle_timeout = idle_timeout  # in milliseconds
+
+        # off when the caller sleeps between frames itself, e.g. in an asyncio loop (see client_pygame.py)
+        self.sleeps = True
+
+        self.clock = pygame.time.Clock()
+        self.needs_redraw = True
+
+        # seconds the last get_events call slept (waiting for events and pacing), see profiler.py
+        self.wait_time = 0.0
+
+    def get_events(self) -> list[pygame.event.Event]:
+        """
+        Returns the pending events and paces the loop to the target fps.
+        In redraw-on-change mode the process sleeps in pygame.event.wait while
+        there is nothing to draw, so an idle window costs next to no CPU.
+        """
+        events = []
+        start = perf_counter()
+        if self.sleeps and self.redraw_on_change and not self.needs_redraw:
+            event = pygame.event.wait(self.idle_timeout)
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        wait_end = perf_counter()
+        events.extend(pygame.event.get())
+        tick_start = perf_counter()
+        if self.sleeps:
+            self.clock.tick(self.target_fps)
+        self.wait_time = wait_end - start + perf_counter() - tick_start
+
+        if events:
+            self.needs_redraw = True
+        return events
+
+    def request_redraw(self) -> None:
+        self.needs_redraw = True
+
+    def frame_done(self) -> None:
+        self.needs_redraw = not self.redraw_on_change
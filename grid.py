@@ -0,0 +1,83 @@
+# Local folder imports
+from tile import Tile
+
+
+def pack_bits(data: bytes | bytearray) -> bytes:
+    """
+    Packs a sequence of 0/1 bytes into a bitmap, 8 cells per byte (first cell in the highest bit).
+    Every 8th byte is read as one big integer, so the packing runs without a Python level loop.
+    """
+    size = (len(data) + 7) // 8
+    data = bytes(data) + bytes(size * 8 - len(data))
+    packed = 0
+    for bit in range(8):
+        packed |= int.from_bytes(data[bit::8], "big") << (7 - bit)
+    return packed.to_bytes(size, "big")
+
+
+def unpack_bits(bitmap: bytes | memoryview, length: int) -> bytearray:
+    """
+    Unpacks a bitmap made by pack_bits back into length 0/1 bytes.
+    """
+    size = len(bitmap)
+    packed = int.from_bytes(bitmap, "big")
+    mask = int.from_bytes(b"\x01" * size, "big")
+    data = bytearray(size * 8)
+    for bit in range(8):
+        data[bit::8] = ((packed >> (7 - bit)) & mask).to_bytes(size, "big")
+    del data[length:]
+    return data
+
+
+# ------------ class setup ------------
+class ByteGrid:
+    """
+    A width x height grid of small integers (0-255), stored row by row in a single bytearray.
+    Cells are addressed as grid[x, y].
+    """
+    def __init__(self, width: int, height: int, fill: int = 0) -> None:
+        self.width = width
+        self.height = height
+        self.data = bytearray([fill]) * (width * height)
+
+    def __getitem__(self, pos: tuple[int, int]) -> int:
+        x, y = pos
+        return self.data[y * self.width + x]
+
+    def __setitem__(self, pos: tuple[int, int], value: int) -> None:
+        x, y = pos
+        self.data[y * self.width + x] = value
+
+    def row(self, y: int, x_start: int = 0, x_end: int | None = None) -> bytearray:
+        offset = y * self.width
+        return self.data[offset + x_start:offset + (self.width if x_end is None else x_end)]
+
+    def column(self, x: int, y_start: int = 0, y_end: int | None = None) -> bytearray:
+        y_end = self.height if y_end is None else y_end
+        return self.data[y_start * self.width + x:y_end * self.width:self.width]
+
+    def rect(self, x_start: int, y_start: int, x_end: int, y_end: int) -> list[bytearray]:
+        return [self.row(y, x_start, x_end) for y in range(y_start, y_end)]
+
+    def fill_row(self, y: int, x_start: int, x_end: int, value: int) -> None:
+        offset = y * self.width
+        self.data[offset + x_start:offset + x_end] = bytes([value]) * (x_end - x_start)
+
+    def fill_rect(self, x_start: int, y_start: int, x_end: int, y_end: int, value: int) -> None:
+        for y in range(y_start, y_end):
+            self.fill_row(y, x_start, x_end, value)
+
+
+# ------------ subclass setup ------------
+class TileGrid(ByteGrid):
+    """
+    Terrain grid holding tile IDs, which index the tile palette (Tile.palette).
+    """
+    def __init__(self, width: int, height: int, fill: Tile) -> None:
+        super().__init__(width, height, fill.id)
+
+    def tile_at(self, x: int, y: int) -> Tile:
+        return Tile.palette[self.data[y * self.width + x]]
+
+    def set_tile(self, x: int, y: int, tile: Tile) -> None:
+        self.data[y * self.width + x] = tile.id
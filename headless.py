@@ -0,0 +1,128 @@
+# Standard library imports
+import argparse
+import time
+from collections.abc import Callable, Iterable
+from random import Random
+from typing import NamedTuple
+
+# Local folder imports
+from character import Player
+from engine import ATTACK, BLOCKED, GameState, new_game_state, step
+from map import Map
+from rng import RngStreams
+from spawner import spawn_table, SpawnTable
+from weapon import Weapon
+
+MAX_BLOCKED = 100  # blocked actions in a row after which an agent counts as stuck
+
+
+# ------------ agent setup ------------
+class RandomAgent:
+    """
+    Attacks while in combat, otherwise moves to a random available direction.
+    """
+    def __init__(self, rng: Random) -> None:
+        self.rng = rng
+
+    def act(self, state: GameState) -> str:
+        if state.enemy:
+            return ATTACK
+        options = [direction for direction, possible in state.player.movement_options.items() if possible]
+        return self.rng.choice(options)
+
+
+class ScriptedAgent:
+    """
+    Plays a fixed sequence of actions over and over, attacking whenever it is in combat.
+    """
+    def __init__(self, actions: Iterable[str]) -> None:
+        self.actions = list(actions)
+        self.index = 0
+
+    def act(self, state: GameState) -> str:
+        if state.enemy:
+            return ATTACK
+        action = self.actions[self.index % len(self.actions)]
+        self.index += 1
+        return action
+
+
+# ------------ result setup ------------
+class GameResult(NamedTuple):
+    seed: int
+    survived: bool
+    turns: int
+    kills: int
+    health: int
+
+
+def simulate(seed: int,
+             agent=None,
+             max_turns: int = 500,
+             map_w: int = 30,
+             map_h: int = 15,
+             spawn_chance: int | None = None,
+             weapon: Weapon | None = None,
+             spawn_table: SpawnTable = spawn_table,
+             roaming: bool = False,
+             track_exploration: bool = False,
+             ) -> GameResult:
+    """
+    Plays one game without any input or output until the player dies or max_turns is reached.
+    The same seed always plays the same game. With roaming, enemies live on the map (see population.py).
+    """
+    rng = RngStreams(seed)
+    player = Player()
+    if weapon:
+        player.weapon = weapon
+    state = new_game_state(Map(map_w, map_h, seed=seed), player, rng, spawn_chance, spawn_table, roaming,
+                           track_exploration)
+    agent = agent or RandomAgent(rng.stream("agent"))
+    play(state, agent, max_turns)
+    return GameResult(seed, not state.game_over, state.turn, state.kills, player.health)
+
+
+def play(state: GameState, agent, max_turns: int, on_action: Callable[[str], None] | None = None) -> GameState:
+    """
+    Lets the agent play until the player dies or max_turns is reached.
+    Blocked actions take no turn, so an agent stuck on them for MAX_BLOCKED actions in a row stops too.
+    """
+    blocked = 0
+    while state.turn < max_turns and not state.game_over and blocked < MAX_BLOCKED:
+        action = agent.act(state)
+        if on_action:
+            on_action(action)
+        _, events = step(state, action)
+        blocked = blocked + 1 if events and events[0].kind == BLOCKED else 0
+    return state
+
+
+def run_games(n: int, seed: int = 0, **options) -> list[GameResult]:
+    """
+    Plays n games with the seeds seed, seed + 1, ..., see simulate for the options.
+    """
+    return [simulate(seed + index, **options) for index in range(n)]
+
+
+def summarize(results: list[GameResult]) -> str:
+    games = len(results)
+    survived = sum(result.survived for result in results)
+    return (f"games: {games}  survival rate: {survived / games:.1%}  "
+            f"avg turns: {sum(result.turns for result in results) / games:.1f}  "
+            f"avg kills: {sum(result.kills for result in results) / games:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="play games with a random agent, without a terminal or window")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--turns", type=int, default=500, help="maximum turns per game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--spawn-chance", type=int, default=None, help="chance (in percent) of an enemy per move")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_games(args.games, args.seed, max_turns=args.turns, spawn_chance=args.spawn_chance)
+    elapsed = time.perf_counter() - start
+
+    print(summarize(results))
+    print(f"{args.games / elapsed:.0f} games/sec")
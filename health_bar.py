@@ -1,5 +1,5 @@
 # Standard library imports
-from typing import TYPE_CHECKING
+from typing import Callable, TYPE_CHECKING
 
 if TYPE_CHECKING:
     # Local folder imports
@@ -37,16 +37,28 @@ class HealthBar:
         self.is_colored = is_colored
         self.color = self.colors.get(color) or self.colors["default"]
 
+        # callbacks notified whenever the health of the entity changes (e.g. the pygame widgets)
+        self.listeners: list[Callable[[], None]] = []
+
     def update(self) -> None:
+        if self.current_value == self.entity.health:
+            return
         self.current_value = self.entity.health
+        for listener in self.listeners:
+            listener()
 
     def draw(self) -> None:
+        print("\n".join(self.render()))
+
+    def render(self) -> list[str]:
         remaining_bars = round(self.current_value / self.max_value * self.length)
         lost_bars = self.length - remaining_bars
-        print(f"{self.entity.name}'s HEALTH: {self.entity.health}/{self.entity.health_max}")
-        print(f"{self.barrier}"
-              f"{self.color if self.is_colored else ''}"
-              f"{remaining_bars * self.symbol_remaining}"
-              f"{lost_bars * self.symbol_lost}"
-              f"{self.colors['default'] if self.is_colored else ''}"
-              f"{self.barrier}")
+        return [
+            f"{self.entity.name}'s HEALTH: {self.entity.health}/{self.entity.health_max}",
+            f"{self.barrier}"
+            f"{self.color if self.is_colored else ''}"
+            f"{remaining_bars * self.symbol_remaining}"
+            f"{lost_bars * self.symbol_lost}"
+            f"{self.colors['default'] if self.is_colored else ''}"
+            f"{self.barrier}"
+        ]
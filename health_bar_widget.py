@@ -0,0 +1,73 @@
+# Standard library imports
+from typing import TYPE_CHECKING
+
+# Third-party imports
+import pygame
+
+if TYPE_CHECKING:
+    # Local folder imports
+    from character import Character
+    from text_cache import TextCache
+
+
+# ------------ class setup ------------
+class HealthBarWidget:
+    length: int = 200
+    height: int = 24
+    outline_width: int = 3
+
+    def __init__(self,
+                 color: tuple[int, int, int],
+                 center_x: int,
+                 y: int,
+                 text_cache: "TextCache",
+                 entity: "Character | None" = None,
+                 ) -> None:
+        self.color = color
+        self.rect = pygame.Rect(0, 0, self.length, self.height)
+        self.rect.midtop = (center_x, y)
+        self.text_cache = text_cache
+
+        # ----- the background and the outline never change, so they are built once
+        self.background = pygame.Surface(self.rect.size).convert()
+        self.background.fill("gray")
+        self.outline = pygame.Surface(self.rect.size, pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(self.outline, "black", self.outline.get_rect(), width=self.outline_width)
+
+        self.fill_surfaces: dict[tuple[int, int, tuple[int, int, int]], pygame.Surface] = {}
+        self.surface = self.background.copy()
+        self.text_surface: pygame.Surface | None = None
+
+        self.entity = None
+        if entity:
+            self.bind(entity)
+
+    def bind(self, entity: "Character") -> None:
+        """
+        Attaches the widget to an entity and re-renders it whenever the entity's health bar is updated.
+        """
+        if self.entity:
+            self.entity.health_bar.listeners.remove(self.refresh)
+        self.entity = entity
+        entity.health_bar.listeners.append(self.refresh)
+        self.refresh()
+
+    def get_fill_surface(self, hp: int, max_hp: int) -> pygame.Surface:
+        key = (hp, max_hp, self.color)
+        if key not in self.fill_surfaces:
+            width = max(round(hp / max_hp * self.length), 1)
+            fill_surface = pygame.Surface((width, self.height)).convert()
+            fill_surface.fill(self.color)
+            self.fill_surfaces[key] = fill_surface
+        return self.fill_surfaces[key]
+
+    def refresh(self) -> None:
+        hp, max_hp = self.entity.health, self.entity.health_max
+        self.surface.blit(self.background, (0, 0))
+        self.surface.blit(self.get_fill_surface(hp, max_hp), (0, 0))
+        self.surface.blit(self.outline, (0, 0))
+        self.text_surface = self.text_cache.render(f"{hp}/{max_hp}", 24, "black")
+
+    def draw(self, screen: pygame.Surface) -> None:
+        screen.blit(self.surface, self.rect)
+        screen.blit(self.text_surface, self.text_surface.get_rect(midtop=self.rect.midtop))
@@ -0,0 +1,108 @@
+# Standard library imports
+import atexit
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import TextIO
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import select
+    import termios
+    import tty
+
+ENTER_KEYS = ("", "\n", "\r")
+
+
+# ------------ abstract class setup ------------
+class InputBackend(ABC):
+    @abstractmethod
+    def poll(self, timeout: float | None = 0) -> str | None:
+        """
+        Returns the next key (or line) of input, waiting at most timeout seconds for it (None waits forever).
+        Returns None if nothing arrived in time and raises EOFError once the input is exhausted.
+        """
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+# ------------ terminal input setup ------------
+class TerminalInput(InputBackend):
+    """
+    Reads the terminal. In instant mode every key press is returned as it happens
+    (cbreak tty on Linux, msvcrt on Windows), otherwise whole lines once ENTER is pressed.
+    """
+    def __init__(self, instant: bool = False, stream: TextIO = sys.stdin) -> None:
+        self.instant = instant
+        self.stream = stream
+        self.buffer = ""
+        self.saved_attributes = None
+
+        if os.name != "nt":
+            self.fd = stream.fileno()
+            if instant and stream.isatty():
+                self.saved_attributes = termios.tcgetattr(self.fd)
+                tty.setcbreak(self.fd)
+                atexit.register(self.close)
+
+    def close(self) -> None:
+        if self.saved_attributes:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved_attributes)
+            self.saved_attributes = None
+
+    def poll(self, timeout: float | None = 0) -> str | None:
+        if os.name == "nt":
+            return self.poll_windows(timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.has_input():
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return None
+            data = os.read(self.fd, 1024).decode(errors="ignore")
+            if not data:
+                raise EOFError
+            self.buffer += data
+        return self.take_input()
+
+    def poll_windows(self, timeout: float | None) -> str | None:
+        if not self.instant:
+            return input()  # the Windows console can't wait on stdin with a timeout
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(0.01)
+        return msvcrt.getwch()
+
+    def has_input(self) -> bool:
+        return bool(self.buffer) if self.instant else "\n" in self.buffer
+
+    def take_input(self) -> str:
+        if self.instant:
+            key, self.buffer = self.buffer[0], self.buffer[1:]
+            return key
+        line, self.buffer = self.buffer.split("\n", 1)
+        return line.rstrip("\r")
+
+
+# ------------ scripted input setup ------------
+class ScriptedInput(InputBackend):
+    """
+    Plays back a fixed sequence of keys, e.g. for replays and automated runs.
+    """
+    def __init__(self, keys: Iterable[str]) -> None:
+        self.keys = iter(keys)
+
+    def poll(self, timeout: float | None = 0) -> str | None:
+        try:
+            return next(self.keys)
+        except StopIteration:
+            raise EOFError from None
@@ -1,7 +1,10 @@
 # Standard library imports
-from random import randint
+from math import sqrt
+from random import Random
 
 # Local folder imports
+from fov import FieldOfView
+from grid import ByteGrid, TileGrid
 from tile import (
     forest,
     mountain,
@@ -14,22 +17,104 @@ from tile import (
 )
 
 
+# tile, number of patches, min size and max size of patches on a map of the reference size
+PATCH_TABLE = [
+    (forest, 3, 3, 7),
+    (pines, 3, 3, 7),
+    (mountain, 3, 3, 7),
+    (water, 2, 3, 10),
+    (town, 1, 3, 3),
+]
+REFERENCE_AREA = 30 * 15
+
+
+def scaled_patch_table(width: int, height: int) -> list[tuple[Tile, int, int, int]]:
+    """
+    Scales the patch table to the given area: patches get larger with the square root of the scale,
+    and the rest of the growth goes into the number of patches, so the terrain mix stays the same.
+    """
+    scale = sqrt(width * height / REFERENCE_AREA)
+    size_scale = max(sqrt(scale), 1)
+    count_scale = (scale / size_scale) ** 2
+    return [
+        (tile, max(round(num_patches * count_scale), 1), round(min_size * size_scale), round(max_size * size_scale))
+        for tile, num_patches, min_size, max_size in PATCH_TABLE
+    ]
+
+
+def place_patches(
+        terrain: TileGrid,
+        rng: Random,
+        tile: Tile,
+        num_patches: int,
+        min_size: int,
+        max_size: int,
+        irregular: int = True,
+        area: tuple[int, int, int, int] | None = None,
+) -> None:
+    """
+    Places the patches inside the terrain, keeping a 1 tile border where possible.
+    With an area (x, y, width, height), the patches start anywhere inside the area instead and may reach out of it,
+    e.g. into the neighbouring chunks of an endless world.
+    """
+    width, height = terrain.width, terrain.height
+    randint, random = rng.randint, rng.random
+    if area is None:
+        # ----- patches can't be larger than the map (minus a 1 tile border where possible)
+        max_size = max(min(max_size, width - 2, height - 2), 1)
+    else:
+        area_x, area_y, area_w, area_h = area
+        max_size = max(min(max_size, area_w, area_h), 1)
+    min_size = min(min_size, max_size)
+
+    for _ in range(num_patches):
+        size_y = randint(min_size, max_size)  # height of patch
+        size_x = randint(min_size, max_size)  # width of patch
+        if area is None:
+            start_y = randint(1, max(height - size_y - 1, 1))  # top row
+            start_x = randint(1, max(width - size_x - 1, 1))  # start of row
+            if irregular:
+                raw_start_x = randint(min(3, width - 1), max(width - max_size, 3))  # start of row
+        else:
+            start_y = area_y + randint(0, area_h - 1)
+            start_x = raw_start_x = area_x + randint(0, area_w - 1)
+
+        # ----- every row of the patch is filled with a single slice assignment
+        min_row_size = int(0.7 * max_size)
+        row_size_range = max_size - min_row_size + 1
+        for y in range(max(start_y, 0), min(start_y + size_y, height)):
+            if irregular:
+                size_x = min_row_size + int(random() * row_size_range)  # randomized width of row
+                start_x = raw_start_x - 1 - int(random() * 2)  # randomized start of row
+            end_x = min(start_x + size_x, width)
+            if end_x > max(start_x, 0):
+                terrain.fill_row(y, max(start_x, 0), end_x, tile.id)
+
+
 class Map:
-    def __init__(self, width, height) -> None:
+    def __init__(self, width, height, seed: int | None = None, sight_radius: int = 2, generate: bool = True) -> None:
         self.width = width
         self.height = height
+        # the seed is always known, so the same map can be generated again (e.g. to reproduce a bug report)
+        self.seed = Random().getrandbits(32) if seed is None else seed
+        self.rng = Random(self.seed)
+        self.fov = FieldOfView(sight_radius)
+
+        # terrain is stored as one tile ID byte per cell, exploration as one 0/1 byte per cell
+        self.terrain: TileGrid
+        self.exploration_process: ByteGrid
 
-        self.init_map_data: list[list[str]]
-        self.full_map_data: list[[str]]
-        self.map_data: list[[str]]
-        self.exploration_process: list[list[int]]
+        # entities drawn over the terrain (e.g. the player), the terrain itself is never modified by them
+        self.overlay: dict[tuple[int, int], Tile] = {}
+        self.marker_positions: dict[Tile, tuple[int, int]] = {}
 
+        # bumped whenever the terrain changes, so whatever is derived from it (e.g. paths) knows to recompute
+        self.terrain_version = 0
+
+        # ----- a map restored from a snapshot gets its terrain from there (see snapshot.py)
         self.generate_map()
-        self.generate_patch(forest, 3, 3, 7)
-        self.generate_patch(pines, 3, 3, 7)
-        self.generate_patch(mountain, 3, 3, 7)
-        self.generate_patch(water, 2, 3, 10)
-        self.generate_patch(town, 1, 3, 3)
+        if generate:
+            self.generate_patches()
 
         self.movement_options = {
             "up": "[W] - UP",
@@ -38,20 +123,23 @@ class Map:
             "right": "[D] - RIGHT"
         }
 
-        self.explored_tiles = [player_marker]
+        # tiles seen so far in order of discovery, a dict is used as an ordered set
+        self.explored_tiles: dict[Tile, None] = {player_marker: None}
 
-    def load_images(self) -> None:
-        for row in self.init_map_data:
-            for tile in row:
-                tile.load_image()
+        # cells whose appearance changed since the last render (newly revealed or marker moved),
+        # only tracked once a renderer asks for them (see track_dirty_cells), otherwise nobody would empty the set
+        self.dirty_cells: set[tuple[int, int]] | None = None
 
-        self.copy_map()
+        # cells seen from the last position the map was revealed from
+        self.visible_cells: set[tuple[int, int]] = set()
 
     def generate_map(self) -> None:
-        self.init_map_data = [[plains for _ in range(self.width)] for _ in range(self.height)]
-        self.copy_map()
+        self.terrain = TileGrid(self.width, self.height, plains)
+        self.exploration_process = ByteGrid(self.width, self.height)
 
-        self.exploration_process = [[0 for _ in range(self.width)] for _ in range(self.height)]
+    def generate_patches(self) -> None:
+        for tile, num_patches, min_size, max_size in scaled_patch_table(self.width, self.height):
+            self.generate_patch(tile, num_patches, min_size, max_size)
 
     def generate_patch(
             self,
@@ -61,73 +149,148 @@ class Map:
             max_size: int,
             irregular: int = True
     ) -> None:
-        for _ in range(num_patches):
-            size_y = randint(min_size, max_size)  # height of patch
-            size_x = randint(min_size, max_size)  # width of patch
-            start_y = randint(1, self.height - size_y - 1)  # top row
-            start_x = randint(1, self.width - size_x - 1)  # start of row
+        place_patches(self.terrain, self.rng, tile, num_patches, min_size, max_size, irregular)
+        self.terrain_version += 1
 
-            if irregular:
-                raw_start_x = randint(3, self.width - max_size)  # start of row
+    # ----- cell access, overridden by maps with a different storage (see World)
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def terrain_at(self, x: int, y: int) -> Tile:
+        return self.terrain.tile_at(x, y)
+
+    def terrain_row(self, y: int, x_start: int, x_end: int) -> bytearray:
+        return self.terrain.row(y, x_start, x_end)
+
+    def is_explored(self, x: int, y: int) -> bool:
+        return bool(self.exploration_process[x, y])
+
+    def explored_row(self, y: int, x_start: int, x_end: int) -> bytearray:
+        return self.exploration_process.row(y, x_start, x_end)
 
-            for i in range(size_y):
-                if irregular:
-                    size_x = randint(int(0.7 * max_size), max_size)  # randomized width of row
-                    start_x = raw_start_x - randint(1, 2)  # randomized start of row
-                for j in range(size_x):
-                    self.init_map_data[start_y + i][start_x + j] = tile
-        self.copy_map()
+    def explore(self, x: int, y: int) -> bool:
+        """
+        Marks the cell explored, returns whether it was unexplored before.
+        """
+        if self.exploration_process[x, y]:
+            return False
+        self.exploration_process[x, y] = 1
+        return True
+
+    def clip(self, x_start: int, y_start: int, x_end: int, y_end: int) -> tuple[int, int, int, int]:
+        """
+        Clips a rectangle of cells (end exclusive) to the map.
+        """
+        return max(x_start, 0), max(y_start, 0), min(x_end, self.width), min(y_end, self.height)
+
+    def clamp_view(self, x: int, y: int, width: int, height: int) -> tuple[int, int]:
+        """
+        Moves the top left cell of a displayed window so the window stays on the map.
+        """
+        return max(min(x, self.width - width), 0), max(min(y, self.height - height), 0)
 
     def display_movement_options(self, options: dict[str, bool]) -> None:
-        for direction, value in self.movement_options.items():
-            if options.get(direction):
-                print(value)
+        print("\n".join(self.render_movement_options(options)))
+
+    def render_movement_options(self, options: dict[str, bool]) -> list[str]:
+        return [value for direction, value in self.movement_options.items() if options.get(direction)]
 
     def reveal_map(self, pos: list[int]) -> None:
-        x, y = pos
-        sight_range = range(-2, 3)
-        fov = [
-            [0, 1, 1, 1, 0],
-            [1, 1, 1, 1, 1],
-            [1, 1, 1, 1, 1],
-            [1, 1, 1, 1, 1],
-            [0, 1, 1, 1, 0],
-
-        ]
-        for y_index in sight_range:
-            tile_y = y + y_index
-            if 0 <= tile_y < self.height:
-                for x_index in sight_range:
-                    tile_x = x + x_index
-                    if 0 <= tile_x < self.width and fov[y_index + 2][x_index + 2]:
-                        self.exploration_process[tile_y][tile_x] = 1
-                        revealed_tile = self.init_map_data[tile_y][tile_x]
-                        if revealed_tile not in self.explored_tiles:
-                            self.explored_tiles.append(revealed_tile)
+        visible_cells = self.fov.visible_cells(self, pos)
+        self.visible_cells = set(visible_cells)
+        dirty_cells = self.dirty_cells
+        for tile_x, tile_y in visible_cells:
+            if self.explore(tile_x, tile_y):
+                if dirty_cells is not None:
+                    dirty_cells.add((tile_x, tile_y))
+                self.explored_tiles.setdefault(self.terrain_at(tile_x, tile_y))
 
     def update_map(self, pos: list[int], marker: Tile) -> None:
-        x, y = pos
-        self.copy_map()
         self.reveal_map(pos)
-        self.map_data[y][x] = marker
-
-    def display_map(self) -> None:
-        frame = "x" + self.width * "=" + "x"
-        print(frame)
-        for y_index, (row, explored_row) in enumerate(zip(self.map_data, self.exploration_process)):
-            if y_index in range(len(self.explored_tiles)):
-                legend = self.explored_tiles[y_index].colored_legend
-            else:
-                legend = ""
-
-            print(
-                "|" + "".join(
-                    [
-                        tile.colored_symbol if is_explored else " " for tile, is_explored in zip(row, explored_row)
-                    ]
-                ) + "| " + legend
-            )
-        print(frame)
-
-    def copy_map(self) -> None:
-        self.map_data = [list(row) for row in self.init_map_data]
+        self.place_marker(pos, marker)
+
+    def place_marker(self, pos: list[int], marker: Tile) -> None:
+        new_pos = (pos[0], pos[1])
+        old_pos = self.marker_positions.get(marker)
+        if old_pos == new_pos:
+            return
+
+        if old_pos and self.overlay.get(old_pos) is marker:
+            del self.overlay[old_pos]
+            self.mark_dirty(old_pos)
+        self.overlay[new_pos] = marker
+        self.marker_positions[marker] = new_pos
+        self.mark_dirty(new_pos)
+
+    def set_terrain(self, x: int, y: int, tile: Tile) -> None:
+        self.terrain.set_tile(x, y, tile)
+        self.terrain_version += 1
+        self.mark_dirty((x, y))
+
+    def set_overlay(self, pos: tuple[int, int], tile: Tile) -> None:
+        """
+        Draws a tile of an entity over the terrain, unless another one (e.g. the player) is already drawn there.
+        """
+        if pos not in self.overlay:
+            self.overlay[pos] = tile
+            self.mark_dirty(pos)
+            self.explored_tiles.setdefault(tile)
+
+    def clear_overlay(self, pos: tuple[int, int], tile: Tile) -> None:
+        if self.overlay.get(pos) is tile:
+            del self.overlay[pos]
+            self.mark_dirty(pos)
+
+    def tile_at(self, x: int, y: int) -> Tile:
+        return self.overlay.get((x, y)) or self.terrain_at(x, y)
+
+    def track_dirty_cells(self) -> None:
+        """
+        Starts collecting the changed cells, for a renderer that empties them with pop_dirty_cells.
+        """
+        if self.dirty_cells is None:
+            self.dirty_cells = set()
+
+    def mark_dirty(self, pos: tuple[int, int]) -> None:
+        if self.dirty_cells is not None:
+            self.dirty_cells.add(pos)
+
+    def pop_dirty_cells(self) -> set[tuple[int, int]]:
+        dirty_cells = self.dirty_cells
+        if dirty_cells is None:
+            return set()
+        self.dirty_cells = set()
+        return dirty_cells
+
+    def display_map(self, view: tuple[int, int, int, int] | None = None) -> None:
+        print("\n".join(self.render_map(view)))
+
+    def render_map(self, view: tuple[int, int, int, int] | None = None) -> list[str]:
+        """
+        Returns the lines of the (x, y, width, height) window of the map, or of the whole map if no window is given.
+        """
+        view_x, view_y, view_width, view_height = view or (0, 0, self.width, self.height)
+        palette = Tile.palette
+        legends = [tile.colored_legend for tile in self.explored_tiles]
+
+        explored_rows = []
+        symbol_rows = []
+        for y in range(view_y, view_y + view_height):
+            explored_row = self.explored_row(y, view_x, view_x + view_width)
+            explored_rows.append(explored_row)
+            symbol_rows.append([
+                palette[tile_id].colored_symbol if is_explored else " "
+                for tile_id, is_explored in zip(self.terrain_row(y, view_x, view_x + view_width), explored_row)
+            ])
+        for (marker_x, marker_y), marker in self.overlay.items():
+            x_index, y_index = marker_x - view_x, marker_y - view_y
+            if 0 <= x_index < view_width and 0 <= y_index < view_height and explored_rows[y_index][x_index]:
+                symbol_rows[y_index][x_index] = marker.colored_symbol
+
+        frame = "x" + view_width * "=" + "x"
+        lines = [frame]
+        for y_index, symbols in enumerate(symbol_rows):
+            legend = legends[y_index] if y_index < len(legends) else ""
+            lines.append("|" + "".join(symbols) + "| " + legend)
+        lines.append(frame)
+        return lines
@@ -0,0 +1,252 @@
+# Standard library imports
+import heapq
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+
+# Local folder imports
+from map import Map
+from tile import Tile
+
+# cost of entering a cell of the tile (tiles not listed cost 1), None means the tile can't be entered
+MOVE_COSTS = {"forest": 2, "pines": 2, "mountain": 5, "water": None}
+NEIGHBOURS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+UNREACHABLE = -1
+
+Bounds = tuple[int, int, int, int]
+
+
+# ------------ class setup ------------
+class DistanceField:
+    """
+    Cost of the cheapest path from every cell inside the bounds to the nearest of the targets,
+    computed once (Dijkstra from all targets at once) and shared by everyone heading to them:
+    each of them only has to look at its 4 neighbours to take a step.
+    """
+    __slots__ = ("bounds", "width", "distances", "costs")
+
+    def __init__(self, bounds: Bounds, distances: list[int], costs: bytes) -> None:
+        self.bounds = bounds
+        self.width = bounds[2] - bounds[0]
+        self.distances = distances
+        self.costs = costs
+
+    def distance(self, x: int, y: int) -> int | None:
+        """
+        Returns the cost to the nearest target, or None if no target can be reached from the cell.
+        """
+        x_start, y_start, x_end, y_end = self.bounds
+        if not (x_start <= x < x_end and y_start <= y < y_end):
+            return None
+        distance = self.distances[(y - y_start) * self.width + x - x_start]
+        return None if distance == UNREACHABLE else distance
+
+    def next_step(self, x: int, y: int, can_enter: Callable[[int, int], bool] | None = None) -> tuple[int, int] | None:
+        """
+        Returns the next cell on the cheapest way to the targets (among the neighbours that can be entered),
+        or None if no neighbour gets closer, e.g. on a target.
+        """
+        distance = self.distance(x, y)
+        if distance is None:
+            return None
+        best, best_total = None, None
+        for next_x, next_y in ((x + step_x, y + step_y) for step_x, step_y in NEIGHBOURS):
+            next_distance = self.distance(next_x, next_y)
+            if next_distance is None or next_distance >= distance:
+                continue
+            # ----- the way through a neighbour costs entering it plus its own distance
+            total = next_distance + self.costs[(next_y - self.bounds[1]) * self.width + next_x - self.bounds[0]]
+            if (best_total is None or total < best_total) and (can_enter is None or can_enter(next_x, next_y)):
+                best, best_total = (next_x, next_y), total
+        return best
+
+    def path(self, x: int, y: int) -> list[tuple[int, int]] | None:
+        """
+        Returns the cells from (x, y) down to the nearest target, or None if none can be reached.
+        """
+        if self.distance(x, y) is None:
+            return None
+        path = [(x, y)]
+        while cell := self.next_step(*path[-1]):
+            path.append(cell)
+        return path
+
+
+# ------------ class setup ------------
+class Pathfinder:
+    """
+    Path queries over the terrain of a map: A* from one cell to another, and distance fields to a set of targets
+    (e.g. the towns, or the player for the chasing enemies), which are cached, as many queries share them.
+    Searches only run inside bounds (x start, y start, x end, y end, ends exclusive), so endless worlds work too.
+    Everything cached is dropped once the terrain of the map changes (see Map.terrain_version), and only then.
+    """
+    def __init__(self, game_map: Map, move_costs: dict[str, int | None] = MOVE_COSTS, max_fields: int = 16) -> None:
+        self.game_map = game_map
+        self.max_fields = max_fields
+
+        # ----- costs by tile ID, to translate rows of terrain bytes into rows of costs (0 can't be entered)
+        costs = bytearray(256)
+        for tile in Tile.palette:
+            cost = move_costs.get(tile.name, 1)
+            costs[tile.id] = cost or 0
+        self.cost_table = bytes(costs)
+
+        self.terrain_version = game_map.terrain_version
+        self.cost_grids: OrderedDict[Bounds, bytes] = OrderedDict()
+        self.fields: OrderedDict[tuple, DistanceField] = OrderedDict()
+
+    def check_terrain(self) -> None:
+        if self.game_map.terrain_version != self.terrain_version:
+            self.terrain_version = self.game_map.terrain_version
+            self.cost_grids.clear()
+            self.fields.clear()
+
+    def bounds_around(self, cells: Iterable[tuple[int, int]], margin: int) -> Bounds:
+        """
+        Returns the bounds containing the cells with margin cells to spare, clipped to the map.
+        """
+        xs, ys = zip(*cells)
+        return self.game_map.clip(min(xs) - margin, min(ys) - margin, max(xs) + margin + 1, max(ys) + margin + 1)
+
+    def cost_grid(self, bounds: Bounds) -> bytes:
+        """
+        Returns the cost of entering every cell inside the bounds, row by row.
+        """
+        self.check_terrain()
+        grid = self.cost_grids.get(bounds)
+        if grid is None:
+            x_start, y_start, x_end, y_end = bounds
+            terrain_row, cost_table = self.game_map.terrain_row, self.cost_table
+            grid = b"".join(terrain_row(y, x_start, x_end).translate(cost_table) for y in range(y_start, y_end))
+            self.cost_grids[bounds] = grid
+            if len(self.cost_grids) > self.max_fields:
+                self.cost_grids.popitem(last=False)
+        else:
+            self.cost_grids.move_to_end(bounds)
+        return grid
+
+    def find_path(self, start: tuple[int, int], goal: tuple[int, int], margin: int = 16) -> list[tuple[int, int]] | None:
+        """
+        Returns the cheapest path from start to goal (A*), both included, or None if there is none.
+        Paths may leave the rectangle spanned by start and goal by at most margin cells.
+        """
+        bounds = self.bounds_around((start, goal), margin)
+        x_start, y_start, x_end, y_end = bounds
+        width = x_end - x_start
+        if not (x_start <= goal[0] < x_end and y_start <= goal[1] < y_end
+                and x_start <= start[0] < x_end and y_start <= start[1] < y_end):
+            return None
+        costs = self.cost_grid(bounds)
+        start_index = (start[1] - y_start) * width + start[0] - x_start
+        goal_index = (goal[1] - y_start) * width + goal[0] - x_start
+        if not costs[goal_index]:
+            return None
+        goal_x, goal_y = goal[0] - x_start, goal[1] - y_start
+
+        # ----- the manhattan distance never overestimates, as entering a cell costs at least 1
+        height = y_end - y_start
+        came_from = [UNREACHABLE] * (width * height)
+        best = [UNREACHABLE] * (width * height)
+        best[start_index] = 0
+        queue = [(0, 0, start_index)]
+        while queue:
+            _, cost, index = heapq.heappop(queue)
+            if index == goal_index:
+                break
+            if cost > best[index]:
+                continue
+            y, x = divmod(index, width)
+            for step_x, step_y in NEIGHBOURS:
+                next_x, next_y = x + step_x, y + step_y
+                if not (0 <= next_x < width and 0 <= next_y < height):
+                    continue
+                next_index = index + step_y * width + step_x
+                step_cost = costs[next_index]
+                if not step_cost:
+                    continue
+                next_cost = cost + step_cost
+                if best[next_index] == UNREACHABLE or next_cost < best[next_index]:
+                    best[next_index] = next_cost
+                    came_from[next_index] = index
+                    estimate = next_cost + abs(goal_x - next_x) + abs(goal_y - next_y)
+                    heapq.heappush(queue, (estimate, next_cost, next_index))
+        else:
+            return None
+
+        path = [goal]
+        index = goal_index
+        while index != start_index:
+            index = came_from[index]
+            y, x = divmod(index, width)
+            path.append((x + x_start, y + y_start))
+        path.reverse()
+        return path
+
+    def distance_field(self, targets: Iterable[tuple[int, int]], bounds: Bounds) -> DistanceField:
+        """
+        Returns the (cached) distance field to the targets inside the bounds.
+        """
+        targets = tuple(sorted(targets))
+        return self.cached_field((targets, bounds), lambda: self.compute_field(targets, bounds))
+
+    def field_to_tile(self, tile: Tile, bounds: Bounds) -> DistanceField:
+        """
+        Returns the (cached) distance field to every cell of the tile (e.g. town) inside the bounds.
+        """
+        return self.cached_field((tile, bounds), lambda: self.compute_field(self.tile_cells(tile, bounds), bounds))
+
+    def cached_field(self, key: tuple, compute: Callable[[], DistanceField]) -> DistanceField:
+        self.check_terrain()
+        field = self.fields.get(key)
+        if field is None:
+            field = self.fields[key] = compute()
+            if len(self.fields) > self.max_fields:
+                self.fields.popitem(last=False)
+        else:
+            self.fields.move_to_end(key)
+        return field
+
+    def compute_field(self, targets: Iterable[tuple[int, int]], bounds: Bounds) -> DistanceField:
+        costs = self.cost_grid(bounds)
+        x_start, y_start, x_end, y_end = bounds
+        width, height = x_end - x_start, y_end - y_start
+        distances = [UNREACHABLE] * (width * height)
+        queue = []
+        for x, y in targets:
+            if x_start <= x < x_end and y_start <= y < y_end:
+                index = (y - y_start) * width + x - x_start
+                distances[index] = 0
+                queue.append((0, index))
+        heapq.heapify(queue)
+
+        # ----- walking from a cell to its neighbour costs entering the neighbour, so searching backwards
+        # from the targets, a cell's distance is its neighbour's plus the cost of entering the neighbour
+        while queue:
+            distance, index = heapq.heappop(queue)
+            if distance > distances[index]:
+                continue
+            step_cost = costs[index]
+            if not step_cost:
+                continue
+            next_distance = distance + step_cost
+            y, x = divmod(index, width)
+            for step_x, step_y in NEIGHBOURS:
+                next_x, next_y = x + step_x, y + step_y
+                if not (0 <= next_x < width and 0 <= next_y < height):
+                    continue
+                next_index = index + step_y * width + step_x
+                if costs[next_index] and (distances[next_index] == UNREACHABLE
+                                          or next_distance < distances[next_index]):
+                    distances[next_index] = next_distance
+                    heapq.heappush(queue, (next_distance, next_index))
+        return DistanceField(bounds, distances, costs)
+
+    def tile_cells(self, tile: Tile, bounds: Bounds) -> list[tuple[int, int]]:
+        x_start, y_start, x_end, y_end = bounds
+        cells = []
+        for y in range(y_start, y_end):
+            row = self.game_map.terrain_row(y, x_start, x_end)
+            x = row.find(tile.id)
+            while x != -1:
+                cells.append((x + x_start, y))
+                x = row.find(tile.id, x + 1)
+        return cells
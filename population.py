@@ -0,0 +1,181 @@
+# Standard library imports
+from random import Random
+
+# Local folder imports
+from character import Enemy
+from map import Map
+from pathfinding import Pathfinder
+from rng import coordinate_seed
+from spatial_hash import SpatialHash
+from spawner import SpawnTable
+from tile import enemy_marker, Tile
+
+# an enemy stays or steps in one of the 4 directions on its turn
+STEPS = ((0, 0), (0, -1), (0, 1), (-1, 0), (1, 0))
+# the regions get other random numbers than the chunks of the world with the same coordinates
+REGION_SALT = 0x27D4EB2F
+
+
+# ------------ class setup ------------
+class EnemyPopulation:
+    """
+    Enemies living on the map, indexed by a spatial hash.
+    The map is populated region by region once the player comes near, so endless worlds work the same
+    as bounded maps. Which enemies live in a region only depends on the seed and the region's coordinates.
+    Only the enemies within the activity radius of the player move (when their turn comes, see scheduler.py),
+    the ones within the chase radius head for the player, all of them following the same distance field,
+    and only the ones in cells the player currently sees are drawn,
+    so the cost of a turn doesn't depend on the size of the population.
+    """
+    def __init__(self,
+                 game_map: Map,
+                 spawn_table: SpawnTable,
+                 seed: int,
+                 rng: Random,
+                 density: float = 1 / 40,
+                 region_size: int = 32,
+                 activity_radius: int = 16,
+                 chase_radius: int = 5,
+                 marker: Tile = enemy_marker,
+                 pathfinder: Pathfinder | None = None,
+                 ) -> None:
+        self.game_map = game_map
+        self.spawn_table = spawn_table
+        self.seed = seed
+        self.rng = rng
+        self.density = density
+        self.region_size = region_size
+        self.activity_radius = activity_radius
+        self.chase_radius = chase_radius
+        self.marker = marker
+        self.pathfinder = pathfinder or Pathfinder(game_map)
+
+        self.index = SpatialHash(bucket_size=16)
+        self.populated_regions: set[tuple[int, int]] = set()
+
+        # cells the marker is drawn at, i.e. enemies the player currently sees
+        self.shown: set[tuple[int, int]] = set()
+
+        # where the player was when the enemies within the activity radius were last looked for (see entering)
+        self.center: tuple[int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def activate(self, pos: list[int]) -> None:
+        """
+        Populates the regions within the activity radius of pos that weren't populated yet.
+        """
+        x, y = pos
+        radius = self.activity_radius
+        for region_y in range((y - radius) // self.region_size, (y + radius) // self.region_size + 1):
+            for region_x in range((x - radius) // self.region_size, (x + radius) // self.region_size + 1):
+                if (region_x, region_y) not in self.populated_regions:
+                    self.populated_regions.add((region_x, region_y))
+                    self.populate_region(region_x, region_y, pos)
+
+    def populate_region(self, region_x: int, region_y: int, player_pos: list[int]) -> None:
+        x_start, y_start, x_end, y_end = self.game_map.clip(region_x * self.region_size,
+                                                            region_y * self.region_size,
+                                                            (region_x + 1) * self.region_size,
+                                                            (region_y + 1) * self.region_size)
+        if x_start >= x_end or y_start >= y_end:
+            return
+
+        rng = Random(coordinate_seed(self.seed, region_x, region_y, REGION_SALT))
+        for _ in range(round((x_end - x_start) * (y_end - y_start) * self.density)):
+            x, y = rng.randrange(x_start, x_end), rng.randrange(y_start, y_end)
+            if [x, y] == player_pos or self.index.at(x, y):
+                continue
+            if enemy := self.spawn_table.spawn(self.game_map.terrain_at(x, y), rng):
+                self.add(enemy, x, y)
+
+    def add(self, enemy: Enemy, x: int, y: int) -> None:
+        enemy.pos = [x, y]
+        self.index.insert(enemy, x, y)
+
+    def remove(self, enemy: Enemy) -> None:
+        if enemy in self.index:
+            self.index.remove(enemy)
+
+    def enemy_at(self, x: int, y: int) -> Enemy | None:
+        enemies = self.index.at(x, y)
+        return enemies[0] if enemies else None
+
+    def can_enter(self, x: int, y: int) -> bool:
+        game_map = self.game_map
+        return (game_map.in_bounds(x, y)
+                and self.spawn_table.allows(game_map.terrain_at(x, y))
+                and not self.index.at(x, y))
+
+    def near_player(self, enemy: Enemy, player_pos: list[int]) -> bool:
+        x, y = enemy.pos
+        return abs(x - player_pos[0]) <= self.activity_radius and abs(y - player_pos[1]) <= self.activity_radius
+
+    def entering(self, player_pos: list[int]) -> list[Enemy]:
+        """
+        Returns the enemies that came within the activity radius since the last call, in the order of their cells.
+        After a single step of the player only the row or column of cells that came into reach is looked at.
+        """
+        x, y = player_pos
+        radius = self.activity_radius
+        if self.center is not None and abs(x - self.center[0]) + abs(y - self.center[1]) == 1:
+            # ----- the edge of the square around the player in the direction of the step
+            step_x, step_y = x - self.center[0], y - self.center[1]
+            edge_x, edge_y = x + step_x * radius, y + step_y * radius
+            x_start, x_end = (edge_x, edge_x + 1) if step_x else (x - radius, x + radius + 1)
+            y_start, y_end = (edge_y, edge_y + 1) if step_y else (y - radius, y + radius + 1)
+            entered = self.index.in_rect(x_start, y_start, x_end, y_end)
+        else:
+            entered = self.index.near(x, y, radius)
+        self.center = (x, y)
+        return [enemy for enemy, _ in sorted(entered, key=lambda item: (item[1][1], item[1][0]))]
+
+    def chase_step(self, enemy: Enemy, player_pos: list[int]) -> tuple[int, int] | None:
+        """
+        Returns the cell the enemy steps to on the way to the player, if it is within the chase radius
+        and there is a way. The distance field is computed once per position of the player, for all chasers.
+        """
+        x, y = enemy.pos
+        player_x, player_y = player_pos
+        radius = self.chase_radius
+        if abs(x - player_x) > radius or abs(y - player_y) > radius:
+            return None
+        # ----- 2 extra cells of room to get around small obstacles
+        bounds = self.game_map.clip(player_x - radius - 2, player_y - radius - 2,
+                                    player_x + radius + 3, player_y + radius + 3)
+        field = self.pathfinder.distance_field(((player_x, player_y),), bounds)
+        return field.next_step(x, y, lambda next_x, next_y: (next_x == player_x and next_y == player_y)
+                               or self.can_enter(next_x, next_y))
+
+    def wander(self, enemy: Enemy, player_pos: list[int], in_combat: bool = False) -> bool:
+        """
+        Moves the enemy one step towards the player if it chases the player, otherwise one random step (or not).
+        Enemies never share a cell.
+        Returns whether the enemy stepped onto the player, which it doesn't while the player is in combat.
+        """
+        x, y = enemy.pos
+        new_x, new_y = self.chase_step(enemy, player_pos) or (x, y)
+        if (new_x, new_y) == (x, y):
+            step_x, step_y = self.rng.choice(STEPS)
+            if not step_x and not step_y:
+                return False
+            new_x, new_y = x + step_x, y + step_y
+        on_player = new_x == player_pos[0] and new_y == player_pos[1]
+        if (on_player and in_combat) or not self.can_enter(new_x, new_y):
+            return False
+        enemy.pos = [new_x, new_y]
+        self.index.move(enemy, new_x, new_y)
+        return on_player
+
+    def update_view(self, visible_cells: set[tuple[int, int]], player_pos: list[int]) -> None:
+        """
+        Draws the marker at the enemies in the visible cells and removes it where they left.
+        """
+        radius = self.game_map.fov.radius
+        shown = {pos for _, pos in self.index.near(player_pos[0], player_pos[1], radius) if pos in visible_cells}
+        for pos in self.shown - shown:
+            self.game_map.clear_overlay(pos, self.marker)
+        for pos in shown - self.shown:
+            self.game_map.set_overlay(pos, self.marker)
+        self.shown = shown
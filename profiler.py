@@ -0,0 +1,147 @@
+# Standard library imports
+import csv
+import json
+import os
+from collections import deque
+from time import perf_counter
+
+
+# ------------ class setup ------------
+class Phase:
+    """
+    Times one phase of the frame, used as a context manager. The last window durations are kept.
+    Phases may be nested (e.g. the game logic runs while handling events): the time spent in the inner phase
+    only counts for the inner one, so the phases of a frame never add up to more than the frame took.
+    """
+    __slots__ = ("name", "durations", "start", "nested", "active")
+
+    def __init__(self, name: str, window: int, active: list["Phase"] | None = None) -> None:
+        self.name = name
+        self.durations: deque[float] = deque(maxlen=window)
+        self.start = 0.0
+        self.nested = 0.0
+
+        # the phases currently running, shared by all phases of a profiler
+        self.active = [] if active is None else active
+
+    def __enter__(self) -> "Phase":
+        self.active.append(self)
+        self.nested = 0.0
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = perf_counter() - self.start
+        self.active.pop()
+        self.durations.append(elapsed - self.nested)
+        if self.active:
+            self.active[-1].nested += elapsed
+
+    def add(self, duration: float) -> None:
+        self.durations.append(duration)
+
+    def exclude(self, duration: float) -> None:
+        """
+        Takes time that wasn't spent working (e.g. sleeping for the frame pacing) out of the last duration.
+        """
+        if self.durations:
+            self.durations[-1] -= duration
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns mean, median, 95th percentile and max of the window in milliseconds.
+        """
+        if not self.durations:
+            return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        durations = sorted(self.durations)
+        count = len(durations)
+        return {
+            "mean": sum(durations) / count * 1000,
+            "p50": durations[count // 2] * 1000,
+            "p95": durations[min(int(count * 0.95), count - 1)] * 1000,
+            "max": durations[-1] * 1000,
+        }
+
+
+# ------------ class setup ------------
+class FrameProfiler:
+    """
+    Rolling timings of the phases of the game loop (e.g. events, display) and of whole frames.
+    Timing costs two perf_counter calls per phase, the statistics are only computed when asked for.
+    With a dump path, the statistics are written every dump_interval seconds:
+    appended as a row to a .csv file, or as the latest snapshot to any other (JSON) file.
+    """
+    def __init__(self, window: int = 120, dump_path: str | None = None, dump_interval: float = 5.0) -> None:
+        self.window = window
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+
+        self.phases: dict[str, Phase] = {}
+        self.active_phases: list[Phase] = []
+        self.frame_times: deque[float] = deque(maxlen=window)
+        self.frames = 0
+        self.last_frame: float | None = None
+        self.last_dump = perf_counter()
+        self.csv_header: list[str] | None = None
+
+        # the overlay is toggled in game (F3)
+        self.overlay = False
+
+    def phase(self, name: str) -> Phase:
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(name, self.window, self.active_phases)
+        return phase
+
+    def frame_done(self) -> None:
+        now = perf_counter()
+        if self.last_frame is not None:
+            self.frame_times.append(now - self.last_frame)
+        self.last_frame = now
+        self.frames += 1
+
+        if self.dump_path and now - self.last_dump >= self.dump_interval:
+            self.last_dump = now
+            self.dump(self.dump_path)
+
+    @property
+    def fps(self) -> float:
+        """
+        Frames per second over the window. In redraw-on-change mode idle time counts too,
+        so this is the rate frames are actually drawn at.
+        """
+        total = sum(self.frame_times)
+        return len(self.frame_times) / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "fps": self.fps,
+            "phases": {name: phase.stats() for name, phase in self.phases.items()},
+        }
+
+    def overlay_lines(self) -> list[str]:
+        return [f"FPS {self.fps:.0f}"] + [
+            f"{name} {phase.stats()['mean']:.2f} ms" for name, phase in self.phases.items()
+        ]
+
+    def dump(self, path: str) -> None:
+        stats = self.stats()
+        if not path.endswith(".csv"):
+            with open(path, "w") as file:
+                json.dump(stats, file, indent=2)
+            return
+
+        row = {"frames": stats["frames"], "fps": round(stats["fps"], 2)}
+        for name, phase_stats in stats["phases"].items():
+            for key, value in phase_stats.items():
+                row[f"{name}_{key}_ms"] = round(value, 4)
+        # ----- a new header is written whenever the phases changed, e.g. when a new one appeared
+        header = list(row)
+        write_header = not os.path.exists(path) or header != self.csv_header
+        self.csv_header = header
+        with open(path, "a", newline="") as file:
+            writer = csv.DictWriter(file, header)
+            if write_header:
+                writer.writeheader()
+            writer.writerow(row)
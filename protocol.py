@@ -0,0 +1,27 @@
+# Standard library imports
+import json
+
+PORT = 8765
+SYNC = "sync"
+DELTA = "delta"
+
+# commands are short, longer lines are refused
+MAX_LINE = 1024
+
+# Messages between the game server and its clients, one JSON object per line.
+# Clients send commands: {"action": "up"}, any of the actions of engine.py.
+# The server sends the whole state once (sync, on joining or after falling behind),
+# from then on only what changed in a tick (delta):
+# cells        newly revealed cells: [x, y, tile ID], the IDs index the palette of the sync
+# players      players that moved or whose health changed: {id: [x, y, health, max health]}
+# left         ids of the players that left
+# you          what only concerns the receiving player: the enemy in combat ([name, health, max health],
+#              null once it's over) and the descriptions of the player's events
+
+
+def encode(message: dict) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+def decode(line: bytes) -> dict:
+    return json.loads(line)
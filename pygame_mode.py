@@ -0,0 +1,397 @@
+# Standard library imports
+from time import perf_counter
+
+# Third-party imports
+import pygame
+
+# Local folder imports
+from assets import AssetManager
+from character import Enemy
+from engine import ATTACK, DOWN, LEFT, RIGHT, UP, Event, GameState
+from frame_scheduler import FrameScheduler
+from game import Game
+from health_bar_widget import HealthBarWidget
+from profiler import FrameProfiler
+from text_cache import TextCache
+from tile import town
+
+TRAVEL_STEP_TIME = 0.08  # seconds between the moves of a travel
+
+
+# ------------ pygame mode setup ------------
+class PygameMode(Game):
+    movement_keys = {pygame.K_w: UP, pygame.K_s: DOWN, pygame.K_a: LEFT, pygame.K_d: RIGHT}
+
+    def __init__(self,
+                 map_w: int = 30,
+                 map_h: int = 15,
+                 target_fps: int = 60,
+                 redraw_on_change: bool = True,
+                 infinite: bool = False,
+                 seed: int | None = None,
+                 view_w: int = 30,
+                 view_h: int = 15,
+                 ) -> None:
+        super().__init__(map_w, map_h, infinite, seed, view_w, view_h)
+
+        # ----- initialize pygame
+        pygame.init()
+        self.frame_scheduler = FrameScheduler(target_fps, redraw_on_change)
+        self.profiler = FrameProfiler()
+        self.profiler_lines: list[str] = []
+        self.profiler_lines_time = 0.0
+        self.text_cache = TextCache("font.ttf")
+        self.last_travel_step = 0.0
+
+        # set tile attributes
+        self.tile_size = 16
+        self.hud_height = 140
+        self.screen_width = self.tile_size * self.camera.width * 2 + self.tile_size * 2
+        self.screen_height = self.tile_size * self.camera.height * 2 + self.hud_height + self.tile_size * 2
+
+        # setup screen
+        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.map_background = pygame.Surface((self.screen_width, self.screen_height - self.hud_height)).convert_alpha()
+        self.map_background.fill("brown")
+        self.assets = AssetManager("images", self.tile_size, 2)
+        self.map_frame = self.assets.load("map_frame", 2)
+        self.hud_frame = self.assets.load("hud_frame", 2)
+        self.hud_rect = pygame.Rect(0, self.screen_height - self.hud_height, self.screen_width, self.hud_height)
+
+        # retained map surface, kept at on-screen scale so only changed cells have to be redrawn
+        self.scaled_tile_size = self.tile_size * 2
+        self.map_surface = pygame.Surface((self.camera.width * self.scaled_tile_size,
+                                           self.camera.height * self.scaled_tile_size)).convert()
+        self.map_surface.fill("black")
+        self.map_rect = self.map_surface.get_rect(topleft=(self.tile_size, self.tile_size))
+        self.dirty_rects: list[pygame.Rect] = []
+        self.game_map.track_dirty_cells()
+        self.full_redraw = True
+        self.view_origin: tuple[int, int] | None = None
+
+        # the images of all tiles are loaded once, whatever the size of the map is
+        self.assets.build_atlas()
+
+        # health bars are only re-rendered when the health of their entity changes
+        self.player_health_bar = HealthBarWidget((40, 200, 40), self.screen_width // 2, self.screen_height - 95,
+                                                 self.text_cache, self.player)
+        self.enemy_health_bar = HealthBarWidget((200, 40, 40), self.screen_width // 2, self.screen_height - 40,
+                                                self.text_cache)
+
+    def restore(self, state: GameState) -> None:
+        super().restore(state)
+        self.game_map.track_dirty_cells()
+        self.player_health_bar.bind(self.player)
+        self.full_redraw = True
+        self.view_origin = None
+        self.frame_scheduler.request_redraw()
+
+    @property
+    def enemy_in_combat(self) -> Enemy | None:
+        return self.state.enemy
+
+    @enemy_in_combat.setter
+    def enemy_in_combat(self, enemy: Enemy | None) -> None:
+        self.state.enemy = enemy
+
+    def run(self) -> None:
+        """
+        Running the game in Pygame mode means continuous cycles.
+        The logic is different and a bit more complicated.
+        """
+        while True:
+            # ----- checking for any event like key presses (sleeps while idle)
+            self.profile_events()
+
+            # ----- nothing changed since the last frame, so there is nothing to draw
+            if not self.frame_scheduler.needs_redraw:
+                continue
+
+            self.render()
+
+    def render(self) -> None:
+        # ----- keep showing the game over screen if the player health pool is empty
+        if self.player.health <= 0:
+            self.display_game_over()
+            return
+
+        # ----- display the map with the tiles
+        with self.profiler.phase("display"):
+            self.display()
+
+        # ----- display combat & non-combat ui
+        with self.profiler.phase("display_ui"):
+            self.display_ui()
+            self.display_profiler()
+
+        # ----- update the changed parts of the window
+        self.update_window()
+
+    def profile_events(self) -> None:
+        # ----- the time slept while idle and for pacing is reported as wait, not as event handling
+        with self.profiler.phase("events") as phase:
+            self.check_events()
+        phase.exclude(self.frame_scheduler.wait_time)
+        self.profiler.phase("wait").add(self.frame_scheduler.wait_time)
+
+    def apply(self, action: str) -> list[Event]:
+        # ----- the game logic (movement options, revealing the map, combat) is timed as a phase of its own,
+        # which is taken out of the events phase it runs in (see Phase)
+        with self.profiler.phase("step"):
+            return super().apply(action)
+
+    def check_events(self) -> None:
+        for event in self.frame_scheduler.get_events():
+            if event.type == pygame.QUIT:
+                exit()
+            elif event.type == pygame.KEYDOWN and self.player.health <= 0:
+                # ----- on the game over screen only ESC closes the game, a queued ENTER is the attack that ended it
+                if event.key == pygame.K_ESCAPE:
+                    exit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.toggle_profiler()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.check_travel_inputs(event)
+            elif event.type == pygame.KEYDOWN:
+                # ----- if an enemy is present, only the enter key is allowed
+                if self.enemy_in_combat:
+                    if event.key == pygame.K_RETURN and (messages := self.next_turn()):
+                        print("\n".join(messages))
+                # ----- if there is no enemy, the player can move the available directions
+                else:
+                    self.check_movement_inputs(event)
+        self.continue_travel()
+
+    def replay_interrupted(self) -> bool:
+        # ----- the window keeps responding during a replay, closing it or ESC ends the replay
+        # (the events are read right away, the replay is paced by play_back)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return True
+        return False
+
+    def check_travel_inputs(self, event) -> None:
+        # ----- clicking a cell of the map travels there, the T key to the nearest town
+        if self.enemy_in_combat or self.player.health <= 0 or self.view_origin is None:
+            return
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.map_rect.collidepoint(event.pos):
+            view_x, view_y = self.view_origin
+            self.travel_to(view_x + (event.pos[0] - self.map_rect.x) // self.scaled_tile_size,
+                           view_y + (event.pos[1] - self.map_rect.y) // self.scaled_tile_size)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+            self.travel_to_nearest(town)
+
+    def continue_travel(self) -> bool:
+        """
+        Takes the next move of the travel once its time has come, returns whether it did.
+        The loop is kept awake meanwhile, as it otherwise sleeps until the next input.
+        """
+        if not self.travel_plan:
+            return False
+        self.frame_scheduler.request_redraw()
+        now = perf_counter()
+        if now - self.last_travel_step < TRAVEL_STEP_TIME:
+            return False
+        self.last_travel_step = now
+        self.travel()
+        return True
+
+    def check_movement_inputs(self, event) -> None:
+        # ----- any key ends a travel, the T key starts one
+        self.travel_plan.clear()
+        if event.key == pygame.K_t:
+            self.check_travel_inputs(event)
+            return
+
+        # ----- moving reveals nearby tiles and may spawn an enemy
+        action = self.movement_keys.get(event.key)
+        if action and self.player.movement_options.get(action):
+            self.apply(action)
+
+    def display(self) -> None:
+        # ----- the background and frames are only drawn once, afterwards just the changed cells
+        if self.full_redraw:
+            self.full_redraw = False
+            self.view_origin = None
+            self.screen.fill("black")
+            self.screen.blit(self.map_background, (0, 0))
+            self.screen.blit(self.map_frame, (0, 0))
+            self.screen.blit(self.hud_frame, self.hud_rect)
+            self.dirty_rects.append(self.screen.get_rect())
+
+        # ----- if the camera scrolled, every visible cell has to be redrawn
+        view_x, view_y, view_w, view_h = self.camera.follow(self.player.pos)
+        if (view_x, view_y) != self.view_origin:
+            self.view_origin = (view_x, view_y)
+            self.game_map.pop_dirty_cells()
+            self.map_surface.fill("black")
+            for y in range(view_y, view_y + view_h):
+                for x in range(view_x, view_x + view_w):
+                    if self.game_map.is_explored(x, y):
+                        self.blit_cell(x, y)
+            self.screen.blit(self.map_surface, self.map_rect)
+            self.dirty_rects.append(self.map_rect)
+            return
+
+        # ----- blit each changed tile onto the map surface if it's explored, then copy it to the screen
+        for x, y in self.game_map.pop_dirty_cells():
+            if not self.camera.contains(x, y):
+                continue
+            if self.game_map.is_explored(x, y):
+                cell_rect = self.blit_cell(x, y)
+                screen_rect = cell_rect.move(self.map_rect.topleft)
+                self.screen.blit(self.map_surface, screen_rect, cell_rect)
+                self.dirty_rects.append(screen_rect)
+
+    def blit_cell(self, x: int, y: int) -> pygame.Rect:
+        view_x, view_y = self.view_origin
+        cell_rect = pygame.Rect((x - view_x) * self.scaled_tile_size, (y - view_y) * self.scaled_tile_size,
+                                self.scaled_tile_size, self.scaled_tile_size)
+        self.map_surface.blit(self.assets.tile_image(self.game_map.tile_at(x, y)), cell_rect)
+        return cell_rect
+
+    def update_window(self) -> None:
+        with self.profiler.phase("update"):
+            pygame.display.update(self.dirty_rects)
+        self.dirty_rects.clear()
+        self.frame_scheduler.frame_done()
+        self.profiler.frame_done()
+
+    def toggle_profiler(self) -> None:
+        self.profiler.overlay = not self.profiler.overlay
+        self.profiler_lines_time = 0.0
+        self.frame_scheduler.request_redraw()
+
+    def display_profiler(self) -> None:
+        """
+        Draws the fps and the mean time of each phase on the right side of the hud, if the overlay is on.
+        The numbers are only refreshed 4 times per second, so they stay readable and the text cache isn't flooded.
+        """
+        if not self.profiler.overlay:
+            return
+        if self.profiler.last_frame is None or self.profiler.last_frame - self.profiler_lines_time >= 0.25:
+            self.profiler_lines = self.profiler.overlay_lines()
+            self.profiler_lines_time = self.profiler.last_frame or 0.0
+        for index, line in enumerate(self.profiler_lines):
+            self.draw_text(line, (self.screen_width - 30, self.hud_rect.top + 22 + index * 15), "right", 16)
+
+    def display_game_over(self) -> None:
+        self.display()
+        self.screen.fill("black", self.hud_rect)
+        self.screen.blit(self.hud_frame, self.hud_rect)
+        self.draw_text("Game Over", (self.screen_width / 2, self.screen_height - 80))
+        self.draw_text("[ESC] - QUIT", (self.screen_width - 40, self.screen_height - 105), "right")
+        self.dirty_rects.append(self.hud_rect)
+        self.update_window()
+
+    def display_ui(self) -> None:
+        # ----- the hud is redrawn as a whole, as its texts change with every action
+        self.screen.fill("black", self.hud_rect)
+        self.screen.blit(self.hud_frame, self.hud_rect)
+        self.dirty_rects.append(self.hud_rect)
+
+        self.draw_text(self.player.name, (self.screen_width / 2, self.screen_height - 110))
+        self.player_health_bar.draw(self.screen)
+
+        if self.enemy_in_combat:
+            self.draw_text("[ENTER] - ATTACK", (self.screen_width - 40, self.screen_height - 105), "right")
+            self.draw_text(self.enemy_in_combat.name, (self.screen_width / 2, self.screen_height - 55))
+            if self.enemy_health_bar.entity is not self.enemy_in_combat:
+                self.enemy_health_bar.bind(self.enemy_in_combat)
+            self.enemy_health_bar.draw(self.screen)
+        else:
+            for index, (direction, value) in enumerate(self.game_map.movement_options.items()):
+                if self.player.movement_options.get(direction):
+                    self.draw_text(value, (40, self.screen_height - 105 + index * 22), "left")
+
+    def next_turn(self) -> list[str]:
+        # ----- prompt a single attack, the enemy is reset if either of the combatants are dead
+        events = self.apply(ATTACK)
+        return [message for event in events if (message := event.describe())]
+
+    def draw_text(self, text: str, pos: list[int], alignment=None, size=30, color="white") -> None:
+        text_surface = self.text_cache.render(text, size, color)
+        text_rect = text_surface.get_rect(center=pos)
+        if alignment == "left":
+            text_rect.midleft = pos
+        elif alignment == "right":
+            text_rect.midright = pos
+        elif alignment == "top":
+            text_rect.midtop = pos
+        self.screen.blit(text_surface, text_rect)
+
+
+# ------------ combined mode setup ------------
+class CombinedMode(PygameMode):
+    def __init__(self,
+                 map_w: int = 30,
+                 map_h: int = 15,
+                 target_fps: int = 60,
+                 redraw_on_change: bool = True,
+                 infinite: bool = False,
+                 seed: int | None = None,
+                 view_w: int = 30,
+                 view_h: int = 15,
+                 ) -> None:
+        super().__init__(map_w, map_h, target_fps, redraw_on_change, infinite, seed, view_w, view_h)
+
+    def run(self) -> None:
+        """
+        Running the game in Combined mode means continuous cycles while displaying ASCII too.
+        The logic is the most complicated, as it's the combination of the two above.
+        We should only update the ASCII display whenever we give an input,
+        as continuous console updating is unreadable.
+        """
+        # ----- necessary initial displaying
+        self.display_ascii()
+
+        while True:
+            # ----- keep handling events on the game over screen if the player health pool is empty
+            if self.player.health <= 0:
+                self.check_events()
+                if self.frame_scheduler.needs_redraw:
+                    self.display_game_over()
+                continue
+
+            # ----- checking for any event like key presses (sleeps while idle)
+            self.profile_events()
+
+            # ----- nothing changed since the last frame, so there is nothing to draw
+            if not self.frame_scheduler.needs_redraw:
+                continue
+
+            # ----- display the map and the ui, then update the changed parts of the window
+            PygameMode.render(self)
+
+    def render(self) -> None:
+        super().render()
+        self.display_ascii(self.enemy_in_combat)
+
+    def display_ascii(self, enemy: Enemy | None = None, messages: list[str] = ()) -> None:
+        with self.profiler.phase("ascii"):
+            super().display_ascii(enemy, messages)
+
+    def check_events(self) -> None:
+        for event in self.frame_scheduler.get_events():
+            if event.type == pygame.QUIT:
+                exit()
+            elif event.type == pygame.KEYDOWN and self.player.health <= 0:
+                # ----- on the game over screen only ESC closes the game, a queued ENTER is the attack that ended it
+                if event.key == pygame.K_ESCAPE:
+                    exit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.toggle_profiler()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.check_travel_inputs(event)
+            elif event.type == pygame.KEYDOWN:
+                # ----- if an enemy is present, only the enter key is allowed and the health bars are displayed
+                if self.enemy_in_combat:
+                    if event.key == pygame.K_RETURN:
+                        messages = self.next_turn()
+                        self.display_ascii(self.enemy_in_combat, messages)  # ASCII
+                # ----- if there is no enemy, the player can move the available directions
+                else:
+                    self.check_movement_inputs(event)
+                    self.display_ascii(self.enemy_in_combat)  # ASCII
+        if self.continue_travel():
+            self.display_ascii(self.enemy_in_combat)  # ASCII
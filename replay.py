@@ -0,0 +1,122 @@
+# Standard library imports
+import json
+import time
+import warnings
+from typing import TYPE_CHECKING
+
+# Local folder imports
+from character import Player
+from engine import ATTACK, DOWN, LEFT, RIGHT, UP, GameState, new_game_state, step
+from headless import play, RandomAgent
+from map import Map
+from rng import RngStreams
+from world import World
+
+if TYPE_CHECKING:
+    # Local folder imports
+    from game import Game
+
+# actions are stored as one character each, so long sessions stay small
+ACTION_CODES = {UP: "w", DOWN: "s", LEFT: "a", RIGHT: "d", ATTACK: "x"}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+# version of the game rules the actions are played with, bumped whenever the same actions play out differently:
+# 1  recordings without a version, made before the turn scheduler
+# 2  actions take time by speed and weapon (see scheduler.py), enemies may act several times per turn
+# 3  the patches of endless worlds reach across the edges of their chunks
+RULES_VERSION = 3
+
+
+# ------------ class setup ------------
+class Recording:
+    """
+    The seed and settings a game was started with and every action applied to it since.
+    As the game only depends on these, replaying the actions plays exactly the same game again.
+    """
+    def __init__(self,
+                 seed: int,
+                 map_w: int = 30,
+                 map_h: int = 15,
+                 infinite: bool = False,
+                 spawn_chance: int | None = None,
+                 health: int = 100,
+                 roaming: bool = False,
+                 actions: list[str] | None = None,
+                 version: int = RULES_VERSION,
+                 ) -> None:
+        self.seed = seed
+        self.map_w = map_w
+        self.map_h = map_h
+        self.infinite = infinite
+        self.spawn_chance = spawn_chance
+        self.health = health
+        self.roaming = roaming
+        self.actions = actions or []
+        self.version = version
+
+    def add(self, action: str) -> None:
+        self.actions.append(action)
+
+    def save(self, path: str) -> None:
+        data = dict(vars(self), actions="".join(ACTION_CODES[action] for action in self.actions))
+        with open(path, "w") as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path) as file:
+            data = json.load(file)
+        data["actions"] = [CODE_ACTIONS[code] for code in data["actions"]]
+        data["version"] = version = data.get("version", 1)
+        if version > RULES_VERSION:
+            raise ValueError(f"unsupported recording version {version}")
+        if version < RULES_VERSION:
+            warnings.warn(f"{path} was recorded with the rules of version {version} (now {RULES_VERSION}), "
+                          f"replaying it plays a different game")
+        return cls(**data)
+
+    def new_state(self, track_exploration: bool = True) -> GameState:
+        """
+        Creates the state the recorded game started from, the same way Game does.
+        """
+        game_map = World(30, 15, self.seed) if self.infinite else Map(self.map_w, self.map_h, self.seed)
+        return new_game_state(game_map, Player(health=self.health), RngStreams(self.seed), self.spawn_chance,
+                              roaming=self.roaming, track_exploration=track_exploration)
+
+
+def replay_headless(recording: Recording, track_exploration: bool = True) -> GameState:
+    """
+    Replays the recording as fast as possible, without rendering or waiting for input.
+    """
+    state = recording.new_state(track_exploration)
+    for action in recording.actions:
+        step(state, action)
+    return state
+
+
+def play_back(game: "Game", recording: Recording, speed: float = 10.0) -> None:
+    """
+    Replays the recording in the game, rendering every action at the given speed in actions per second.
+    The game continues from the state the recording started from (see Recording.new_state),
+    so the rendered replay plays the same game as the headless one. The game may stop it early (e.g. ESC).
+    """
+    game.restore(recording.new_state())
+    game.render()
+    for action in recording.actions:
+        time.sleep(1 / speed)
+        if game.replay_interrupted():
+            return
+        game.apply(action)
+        game.render()
+
+
+def record_session(seed: int, agent=None, max_turns: int = 10000, **options) -> Recording:
+    """
+    Records a game played by an agent (a random one by default), e.g. as a repeatable workload.
+    The options are the ones of Recording.
+    """
+    recording = Recording(seed, **options)
+    state = recording.new_state()
+    agent = agent or RandomAgent(RngStreams(seed).stream("agent"))
+    play(state, agent, max_turns, recording.add)
+    return recording
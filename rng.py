@@ -0,0 +1,28 @@
+# Standard library imports
+from random import Random
+
+
+# ------------ class setup ------------
+class RngStreams:
+    """
+    One seeded random generator per subsystem (e.g. "map", "spawn", "agent"), all derived from a single seed.
+    Drawing more numbers in one subsystem never shifts the numbers of another,
+    so a game stays reproducible from its seed when e.g. the map generation changes.
+    """
+    def __init__(self, seed: int | None = None) -> None:
+        self.seed = Random().getrandbits(32) if seed is None else seed
+        self.streams: dict[str, Random] = {}
+
+    def stream(self, name: str) -> Random:
+        rng = self.streams.get(name)
+        if rng is None:
+            rng = self.streams[name] = Random(f"{name}-{self.seed}")
+        return rng
+
+
+def coordinate_seed(seed: int, x: int, y: int, salt: int = 0) -> int:
+    """
+    A stable mix of the seed and the coordinates (e.g. of a chunk), independent of the order they are visited in.
+    Different salts give unrelated seeds for the same coordinates.
+    """
+    return (seed * 0x9E3779B1 + x * 0x85EBCA77 + y * 0xC2B2AE3D + salt) & 0xFFFFFFFFFFFF
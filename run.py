@@ -1,13 +1,100 @@
 # Standard library imports
+import argparse
 import sys
+import time
 
 # Local folder imports
-from game import AsciiMode, CombinedMode, PygameMode
+from game import AsciiMode
+from protocol import PORT
+from replay import play_back, Recording, replay_headless
+from snapshot import load
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", nargs="?", default="combined", help="ascii, pygame or combined (default)")
+    parser.add_argument("--infinite", action="store_true", help="play on an endless, chunk generated world")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the map generation")
+    parser.add_argument("--width", type=int, default=30, help="width of the map")
+    parser.add_argument("--height", type=int, default=15, help="height of the map")
+    parser.add_argument("--batch", type=int, default=None, metavar="GAMES",
+                        help="simulate this many games with a random agent on all cores instead of playing")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes of the batch (default: all cores)")
+    parser.add_argument("--turns", type=int, default=500, help="maximum turns per game of the batch")
+    parser.add_argument("--spawn-chance", type=int, default=None, help="chance (in percent) of an enemy per move")
+    parser.add_argument("--load", default=None, metavar="PATH", help="continue the game saved in a snapshot")
+    parser.add_argument("--save", default=None, metavar="PATH", help="save a snapshot when the game ends (or crashes)")
+    parser.add_argument("--profile", default=None, metavar="PATH",
+                        help="write frame timings every few seconds to a .csv (appended) or .json file (F3 shows them)")
+    parser.add_argument("--record", default=None, metavar="PATH", help="record the actions of the game to replay it")
+    parser.add_argument("--replay", default=None, metavar="PATH", help="replay a recorded game instead of playing")
+    parser.add_argument("--speed", type=float, default=0,
+                        help="actions per second of the replay, 0 (default) replays headless as fast as possible")
+    parser.add_argument("--serve", action="store_true", help="host a game other players join with --connect")
+    parser.add_argument("--connect", default=None, metavar="HOST", help="join the game hosted on this host")
+    parser.add_argument("--port", type=int, default=PORT, help="port of the hosted game")
+    args = parser.parse_args()
+
+    # ----- the modules of a mode (asyncio, multiprocessing, pygame) are only imported once it's chosen,
+    # so every mode starts without loading the others
+    if args.serve:
+        import asyncio
+        from map import Map
+        from server import GameServer
+        server = GameServer(Map(args.width, args.height, args.seed), spawn_chance=args.spawn_chance)
+        print(f"serving a {args.width}x{args.height} map (seed {server.game_map.seed}) on port {args.port}")
+        asyncio.run(server.serve("0.0.0.0", args.port))
+        sys.exit()
+
+    if args.connect:
+        import asyncio
+        from client import connect
+        asyncio.run(connect(args.connect, args.port, "ascii" if args.mode == "ascii" else "pygame"))
+        sys.exit()
+
+    if args.batch:
+        from batch import run_batch
+        start = time.perf_counter()
+        stats, _ = run_batch(args.batch, seed=args.seed or 0, workers=args.workers, max_turns=args.turns,
+                             map_w=args.width, map_h=args.height, spawn_chance=args.spawn_chance)
+        print(stats.summary())
+        print(f"{args.batch / (time.perf_counter() - start):.0f} games/sec")
+        sys.exit()
+
+    recording = Recording.load(args.replay) if args.replay else None
+    if recording and not args.speed:
+        start = time.perf_counter()
+        state = replay_headless(recording)
+        elapsed = time.perf_counter() - start
+        print(f"replayed {len(recording.actions)} actions in {elapsed * 1000:.1f} ms, "
+              f"turn {state.turn}, kills {state.kills}, health {state.player.health}, position {state.player.pos}")
+        sys.exit()
+
+    options = dict(map_w=args.width, map_h=args.height, infinite=args.infinite, seed=args.seed)
+    if recording:
+        options = dict(map_w=recording.map_w, map_h=recording.map_h, infinite=recording.infinite, seed=recording.seed)
+    if args.mode == "ascii":
+        game = AsciiMode(**options)
+    elif args.mode == "combined":
+        from pygame_mode import CombinedMode
+        game = CombinedMode(**options)
+    else:
+        from pygame_mode import PygameMode
+        game = PygameMode(**options)
+    if args.profile and hasattr(game, "profiler"):
+        game.profiler.dump_path = args.profile
+
+    if recording:
+        play_back(game, recording, args.speed)
+        sys.exit()
+
+    if args.load:
+        game.restore(load(args.load))
+    elif args.record:
+        game.record()
     try:
-        game_mode = sys.argv[1]
-        game = AsciiMode() if game_mode == "ascii" else PygameMode()
-    except IndexError:
-        game = CombinedMode()
-    game.run()
+        game.run()
+    finally:
+        if args.save:
+            game.save(args.save)
+        if game.recording:
+            game.recording.save(args.record)
@@ -0,0 +1,226 @@
+# Standard library imports
+import asyncio
+import json
+from collections import deque
+
+# Local folder imports
+from character import Player
+from engine import ACTIONS, GameState, MOVED, step
+from map import Map
+from protocol import decode, DELTA, encode, MAX_LINE, PORT, SYNC
+from rng import RngStreams
+from tile import Tile
+
+
+# ------------ class setup ------------
+class Session:
+    """
+    A connected player: its own state on the shared map, its pending commands and its outgoing messages.
+    Both queues are bounded. A client sending faster than the ticks loses its newest commands,
+    and a client reading slower than the ticks loses its pending deltas and gets the whole state again instead,
+    so a slow client never makes the server buffer more than max_messages lines for it.
+    """
+    def __init__(self, player_id: int, state: GameState, max_commands: int = 8, max_messages: int = 64) -> None:
+        self.player_id = player_id
+        self.state = state
+        self.max_commands = max_commands
+        self.max_messages = max_messages
+
+        self.commands: deque[str] = deque()
+        self.outbox: deque[bytes] = deque()
+        self.has_output = asyncio.Event()
+        self.needs_sync = True
+        self.last_enemy: list | None = None
+
+    def command(self, action: str) -> None:
+        if len(self.commands) < self.max_commands:
+            self.commands.append(action)
+
+    def send(self, line: bytes) -> None:
+        if len(self.outbox) >= self.max_messages:
+            self.outbox.clear()
+            self.needs_sync = True
+            return
+        self.outbox.append(line)
+        self.has_output.set()
+
+
+# ------------ class setup ------------
+class GameServer:
+    """
+    Owns the authoritative state of a game several players share a map in, and serves it over TCP.
+    Every tick applies at most one command per player, then sends each client what changed (see protocol.py).
+    The part of a delta that is the same for everyone (revealed cells, players) is encoded once per tick.
+    Everything runs in one asyncio loop, so a single core holds dozens of connections.
+    """
+    def __init__(self,
+                 game_map: Map,
+                 tick_rate: int = 20,
+                 max_clients: int = 64,
+                 spawn_chance: int | None = None,
+                 ) -> None:
+        self.game_map = game_map
+        # the revealed cells are sent out every tick (see update)
+        game_map.track_dirty_cells()
+        self.tick_rate = tick_rate
+        self.max_clients = max_clients
+        self.spawn_chance = spawn_chance
+
+        self.rng = RngStreams(game_map.seed)
+        self.sessions: dict[int, Session] = {}
+        self.next_id = 1
+        self.tick = 0
+
+        # what the clients last got of every player, and who left since the last tick
+        self.sent_players: dict[int, list[int]] = {}
+        self.left: list[int] = []
+
+    def join(self) -> Session:
+        player_id = self.next_id
+        self.next_id += 1
+        player = Player(f"Player {player_id}")
+        state = GameState(self.game_map, player, self.rng.stream(f"spawn-{player_id}"), self.spawn_chance,
+                          track_exploration=False)
+        self.game_map.reveal_map(player.pos)
+        session = self.sessions[player_id] = Session(player_id, state)
+        return session
+
+    def leave(self, session: Session) -> None:
+        if self.sessions.pop(session.player_id, None):
+            self.sent_players.pop(session.player_id, None)
+            self.left.append(session.player_id)
+
+    @staticmethod
+    def player_info(player: Player) -> list[int]:
+        return [player.pos[0], player.pos[1], player.health, player.health_max]
+
+    @staticmethod
+    def enemy_info(state: GameState) -> list | None:
+        enemy = state.enemy
+        return [enemy.name, enemy.health, enemy.health_max] if enemy else None
+
+    def sync_message(self, session: Session) -> bytes:
+        terrain, explored = self.game_map.terrain, self.game_map.exploration_process
+        width = self.game_map.width
+        cells = []
+        index = explored.data.find(1)
+        while index != -1:
+            y, x = divmod(index, width)
+            cells.append([x, y, terrain.data[index]])
+            index = explored.data.find(1, index + 1)
+        session.last_enemy = self.enemy_info(session.state)
+        return encode({
+            "type": SYNC,
+            "tick": self.tick,
+            "id": session.player_id,
+            "width": width,
+            "height": self.game_map.height,
+            "palette": [tile.name for tile in Tile.palette],
+            "cells": cells,
+            "players": {player_id: self.player_info(other.state.player) for player_id, other in self.sessions.items()},
+            "you": {"enemy": session.last_enemy, "events": []},
+        })
+
+    def update(self) -> None:
+        """
+        Runs one tick: applies the next command of every player and sends out the changes.
+        """
+        self.tick += 1
+        game_map = self.game_map
+        events = {}
+        for session in self.sessions.values():
+            if session.commands:
+                _, session_events = step(session.state, session.commands.popleft())
+                if any(event.kind == MOVED for event in session_events):
+                    game_map.reveal_map(session.state.player.pos)
+                events[session.player_id] = [text for event in session_events if (text := event.describe())]
+
+        # ----- the part everyone gets
+        cells = [[x, y, game_map.terrain.data[y * game_map.width + x]] for x, y in game_map.pop_dirty_cells()]
+        players = {}
+        for player_id, session in self.sessions.items():
+            info = self.player_info(session.state.player)
+            if info != self.sent_players.get(player_id):
+                self.sent_players[player_id] = players[player_id] = info
+        left, self.left = self.left, []
+        common = {}
+        if cells:
+            common["cells"] = cells
+        if players:
+            common["players"] = players
+        if left:
+            common["left"] = left
+        common_json = json.dumps(common, separators=(",", ":"))[1:-1]
+
+        # ----- the part only the player gets
+        for session in self.sessions.values():
+            if session.needs_sync:
+                session.needs_sync = False
+                session.send(self.sync_message(session))
+                continue
+            you = {}
+            enemy = self.enemy_info(session.state)
+            if enemy != session.last_enemy:
+                session.last_enemy = you["enemy"] = enemy
+            if session_events := events.get(session.player_id):
+                you["events"] = session_events
+            if not common and not you:
+                continue
+            parts = [f'"type":"{DELTA}","tick":{self.tick}']
+            if common_json:
+                parts.append(common_json)
+            if you:
+                parts.append(f'"you":{json.dumps(you, separators=(",", ":"))}')
+            session.send(("{" + ",".join(parts) + "}\n").encode())
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self.sessions) >= self.max_clients:
+            writer.close()
+            return
+        session = self.join()
+        write_task = asyncio.create_task(self.write_loop(session, writer))
+        try:
+            while line := await reader.readline():
+                try:
+                    action = decode(line).get("action")
+                except (ValueError, AttributeError):
+                    continue
+                if action in ACTIONS:
+                    session.command(action)
+        except (ConnectionError, ValueError):
+            pass  # a reset connection or a line over the limit ends the session
+        finally:
+            self.leave(session)
+            write_task.cancel()
+            writer.close()
+
+    @staticmethod
+    async def write_loop(session: Session, writer: asyncio.StreamWriter) -> None:
+        """
+        Writes the outbox of the session. Draining waits while the socket's buffer is full,
+        meanwhile new messages pile up in the (bounded) outbox.
+        """
+        try:
+            while True:
+                await session.has_output.wait()
+                session.has_output.clear()
+                while session.outbox:
+                    writer.write(session.outbox.popleft())
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            self.update()
+            # ----- a late tick doesn't make the following ones come faster
+            next_tick = max(next_tick + interval, loop.time())
+            await asyncio.sleep(next_tick - loop.time())
+
+    async def serve(self, host: str = "127.0.0.1", port: int = PORT) -> None:
+        server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        async with server:
+            await self.run()
@@ -0,0 +1,276 @@
+# Standard library imports
+import mmap
+import struct
+from random import Random
+
+# Local folder imports
+from character import Enemy, enemy_templates, Player
+from engine import GameState
+from grid import ByteGrid, pack_bits, unpack_bits
+from map import Map
+from population import EnemyPopulation
+from scheduler import TurnScheduler
+from spawner import spawn_table
+from tile import Tile
+from weapon import weapons
+from world import World
+
+MAGIC = b"RLSS"
+VERSION = 4
+BOUNDED = 0
+ENDLESS = 1
+
+# who a scheduled actor is, roaming enemies are referred to by their index in the population section
+PLAYER = -2
+ENEMY_IN_COMBAT = -1
+
+# Layout of a snapshot (little endian):
+# header       magic, version, kind (bounded map / endless world)
+# map          width, height, seed, sight radius
+# palette      tile names in ID order, so terrain bytes survive new tiles being added
+# legend       names of the explored tiles in order of discovery
+# player       name, health, max health, weapon, position
+# enemy        whether one is in combat, then name, health, max health, weapon, speed (since version 3)
+# progress     turn, kills, spawn chance
+# rng          state of the spawn rng
+# population   whether enemies roam the map, then its settings (the chase radius since version 4),
+#              the state of its rng, the populated regions
+#              and the enemies: name, health, max health, weapon, speed (since version 3), position
+#              (since version 2)
+# scheduler    time, then the scheduled actors in order of their turns: time and who they are (since version 3)
+# bounded map  terrain (one tile ID byte per cell), exploration (bitmap, one bit per cell)
+# endless map  chunk size, then the explored chunks: chunk coordinates and exploration bitmap
+#              (the terrain of the chunks is regenerated from the seed)
+
+
+# ------------ writer setup ------------
+class SnapshotWriter:
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+
+    def pack(self, fmt: str, *values) -> None:
+        self.parts.append(struct.pack("<" + fmt, *values))
+
+    def string(self, text: str) -> None:
+        self.blob(text.encode())
+
+    def blob(self, data: bytes | bytearray) -> None:
+        self.pack("Q", len(data))
+        self.parts.append(bytes(data))
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.parts)
+
+
+# ------------ reader setup ------------
+class SnapshotReader:
+    def __init__(self, buffer) -> None:
+        self.buffer = memoryview(buffer)
+        self.offset = 0
+
+    def unpack(self, fmt: str) -> tuple:
+        fmt = "<" + fmt
+        values = struct.unpack_from(fmt, self.buffer, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def string(self) -> str:
+        return bytes(self.blob()).decode()
+
+    def blob(self) -> memoryview:
+        size, = self.unpack("Q")
+        data = self.buffer[self.offset:self.offset + size]
+        self.offset += size
+        return data
+
+
+def dumps(state: GameState) -> bytes:
+    game_map, player, enemy = state.game_map, state.player, state.enemy
+    writer = SnapshotWriter()
+    writer.pack("4sHB", MAGIC, VERSION, ENDLESS if isinstance(game_map, World) else BOUNDED)
+
+    writer.pack("IIQH", game_map.width, game_map.height, game_map.seed, game_map.fov.radius)
+    for names in ([tile.name for tile in Tile.palette], [tile.name for tile in game_map.explored_tiles]):
+        writer.pack("H", len(names))
+        for name in names:
+            writer.string(name)
+
+    writer.string(player.name)
+    writer.pack("ii", player.health, player.health_max)
+    writer.string(player.weapon.name)
+    writer.pack("qq", *player.pos)
+
+    writer.pack("?", enemy is not None)
+    if enemy:
+        write_enemy(writer, enemy)
+
+    writer.pack("QQH", state.turn, state.kills, state.spawn_chance)
+
+    write_rng(writer, state.rng)
+
+    population = state.population
+    actor_ids = {player: PLAYER, enemy: ENEMY_IN_COMBAT}
+    writer.pack("?", population is not None)
+    if population is not None:
+        writer.pack("dIII", population.density, population.region_size, population.activity_radius,
+                    population.chase_radius)
+        write_rng(writer, population.rng)
+        writer.pack("Q", len(population.populated_regions))
+        for region in sorted(population.populated_regions):
+            writer.pack("qq", *region)
+        writer.pack("Q", len(population))
+        for index, (roaming_enemy, (x, y)) in enumerate(population.index.positions.items()):
+            write_enemy(writer, roaming_enemy)
+            writer.pack("qq", x, y)
+            actor_ids[roaming_enemy] = index
+
+    scheduler = state.scheduler
+    queue = scheduler.queue()
+    writer.pack("QQ", scheduler.time, len(queue))
+    for time, actor in queue:
+        writer.pack("Qq", time, actor_ids[actor])
+
+    if isinstance(game_map, World):
+        writer.pack("IQ", game_map.chunk_size, len(game_map.explored_chunks))
+        for (chunk_x, chunk_y), explored in game_map.explored_chunks.items():
+            writer.pack("qq", chunk_x, chunk_y)
+            writer.blob(pack_bits(explored.data))
+    else:
+        writer.blob(game_map.terrain.data)
+        writer.blob(pack_bits(game_map.exploration_process.data))
+    return writer.getvalue()
+
+
+def loads(buffer) -> GameState:
+    reader = SnapshotReader(buffer)
+    magic, version, kind = reader.unpack("4sHB")
+    if magic != MAGIC:
+        raise ValueError("not a game snapshot")
+    if version > VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+
+    width, height, seed, sight_radius = reader.unpack("IIQH")
+    tiles = {tile.name: tile for tile in Tile.palette}
+    saved_palette = [reader.string() for _ in range(reader.unpack("H")[0])]
+    legend = [tiles[reader.string()] for _ in range(reader.unpack("H")[0])]
+
+    name = reader.string()
+    health, health_max = reader.unpack("ii")
+    player = Player(name, health_max)
+    player.health = health
+    player.health_bar.update()
+    player.weapon = weapons[reader.string()]
+    player.pos = list(reader.unpack("qq"))
+
+    enemy = read_enemy(reader, version) if reader.unpack("?")[0] else None
+
+    turn, kills, spawn_chance = reader.unpack("QQH")
+
+    rng = read_rng(reader)
+    population_data = read_population(reader, version) if version >= 2 and reader.unpack("?")[0] else None
+    scheduled = None
+    if version >= 3:
+        scheduler_time, num_scheduled = reader.unpack("QQ")
+        scheduled = [reader.unpack("Qq") for _ in range(num_scheduled)]
+
+    if kind == ENDLESS:
+        game_map = World(width, height, seed, sight_radius)
+        game_map.chunk_size, num_chunks = reader.unpack("IQ")
+        cells = game_map.chunk_size * game_map.chunk_size
+        for _ in range(num_chunks):
+            key = reader.unpack("qq")
+            explored = game_map.explored_chunks[key] = ByteGrid(game_map.chunk_size, game_map.chunk_size)
+            explored.data = unpack_bits(reader.blob(), cells)
+    else:
+        game_map = Map(width, height, seed, sight_radius, generate=False)
+        terrain = reader.blob()
+        # ----- tile IDs are translated in case the palette changed since the snapshot was taken
+        palette_ids = bytes(tiles[name].id for name in saved_palette)
+        if palette_ids != bytes(range(len(palette_ids))):
+            terrain = bytes(terrain).translate(palette_ids.ljust(256, b"\0"))
+        game_map.terrain.data = bytearray(terrain)
+        game_map.terrain_version += 1
+        game_map.exploration_process.data = unpack_bits(reader.blob(), width * height)
+
+    game_map.explored_tiles = dict.fromkeys(legend)
+    population = None
+    enemies = []
+    if population_data:
+        settings, population_rng, regions, enemies = population_data
+        population = EnemyPopulation(game_map, spawn_table, seed, population_rng, *settings)
+        population.populated_regions = regions
+        for roaming_enemy, x, y in enemies:
+            population.add(roaming_enemy, x, y)
+        # ----- the enemy in combat is the one living on the player's cell (which stays there if the player died)
+        if enemy is not None:
+            enemy = population.enemy_at(*player.pos)
+
+    # ----- older snapshots start a new schedule, the enemies within reach are scheduled again
+    scheduler = TurnScheduler()
+    if scheduled is not None:
+        scheduler.time = scheduler_time
+        actors = {PLAYER: player, ENEMY_IN_COMBAT: enemy}
+        actors.update((index, roaming_enemy) for index, (roaming_enemy, _, _) in enumerate(enemies))
+        for time, actor_id in scheduled:
+            scheduler.schedule_at(actors[actor_id], time)
+    elif enemy and not population:
+        scheduler.schedule(enemy)
+
+    state = GameState(game_map, player, rng, spawn_chance=spawn_chance, population=population, scheduler=scheduler)
+    state.enemy, state.turn, state.kills = enemy, turn, kills
+    return state
+
+
+def write_rng(writer: SnapshotWriter, rng: Random) -> None:
+    version, internal_state, gauss_next = rng.getstate()
+    writer.pack(f"i{len(internal_state)}I?d", version, *internal_state, gauss_next is not None, gauss_next or 0.0)
+
+
+def read_rng(reader: SnapshotReader) -> Random:
+    rng = Random()
+    version, *internal_state, has_gauss, gauss_next = reader.unpack(f"i{len(rng.getstate()[1])}I?d")
+    rng.setstate((version, tuple(internal_state), gauss_next if has_gauss else None))
+    return rng
+
+
+def write_enemy(writer: SnapshotWriter, enemy: Enemy) -> None:
+    writer.string(enemy.name)
+    writer.pack("ii", enemy.health, enemy.health_max)
+    writer.string(enemy.weapon.name)
+    writer.pack("H", enemy.speed)
+
+
+def read_enemy(reader: SnapshotReader, version: int) -> Enemy:
+    name = reader.string()
+    health, health_max = reader.unpack("ii")
+    weapon = weapons[reader.string()]
+    # ----- enemies of older snapshots get the speed of their template
+    speed = reader.unpack("H")[0] if version >= 3 else enemy_templates[name].speed
+    enemy = Enemy(name, health_max, weapon, speed)
+    enemy.health = health
+    enemy.health_bar.update()
+    return enemy
+
+
+def read_population(reader: SnapshotReader, version: int) -> tuple:
+    settings = reader.unpack("dIII" if version >= 4 else "dII")
+    rng = read_rng(reader)
+    regions = {reader.unpack("qq") for _ in range(reader.unpack("Q")[0])}
+    enemies = [(read_enemy(reader, version), *reader.unpack("qq")) for _ in range(reader.unpack("Q")[0])]
+    return settings, rng, regions, enemies
+
+
+def save(path: str, state: GameState) -> None:
+    with open(path, "wb") as file:
+        file.write(dumps(state))
+
+
+def load(path: str, use_mmap: bool = False) -> GameState:
+    """
+    Restores a game state. With use_mmap the file is memory-mapped for reading instead of read as a whole.
+    """
+    with open(path, "rb") as file:
+        if not use_mmap:
+            return loads(file.read())
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return loads(buffer)
@@ -0,0 +1,80 @@
+# Standard library imports
+from collections.abc import Hashable, Iterator
+
+
+# ------------ class setup ------------
+class SpatialHash:
+    """
+    Uniform grid index of entities by cell: every bucket holds the entities of a bucket_size x bucket_size area.
+    Looking up a cell, a radius or a rectangle only visits the buckets overlapping it,
+    so the cost depends on the area asked for, not on the number of entities.
+    """
+    def __init__(self, bucket_size: int = 16) -> None:
+        self.bucket_size = bucket_size
+        self.buckets: dict[tuple[int, int], dict[Hashable, tuple[int, int]]] = {}
+        self.positions: dict[Hashable, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, entity: Hashable) -> bool:
+        return entity in self.positions
+
+    def bucket_key(self, x: int, y: int) -> tuple[int, int]:
+        return x // self.bucket_size, y // self.bucket_size
+
+    def insert(self, entity: Hashable, x: int, y: int) -> None:
+        if entity in self.positions:
+            self.move(entity, x, y)
+            return
+        self.positions[entity] = (x, y)
+        self.buckets.setdefault(self.bucket_key(x, y), {})[entity] = (x, y)
+
+    def remove(self, entity: Hashable) -> None:
+        x, y = self.positions.pop(entity)
+        key = self.bucket_key(x, y)
+        bucket = self.buckets[key]
+        del bucket[entity]
+        if not bucket:
+            del self.buckets[key]
+
+    def move(self, entity: Hashable, x: int, y: int) -> None:
+        old_x, old_y = self.positions[entity]
+        old_key, new_key = self.bucket_key(old_x, old_y), self.bucket_key(x, y)
+        self.positions[entity] = (x, y)
+        if old_key == new_key:
+            self.buckets[old_key][entity] = (x, y)
+            return
+        bucket = self.buckets[old_key]
+        del bucket[entity]
+        if not bucket:
+            del self.buckets[old_key]
+        self.buckets.setdefault(new_key, {})[entity] = (x, y)
+
+    def at(self, x: int, y: int) -> list[Hashable]:
+        bucket = self.buckets.get(self.bucket_key(x, y))
+        if not bucket:
+            return []
+        return [entity for entity, pos in bucket.items() if pos == (x, y)]
+
+    def in_rect(self, x_start: int, y_start: int, x_end: int, y_end: int) -> Iterator[tuple[Hashable, tuple[int, int]]]:
+        """
+        Yields (entity, position) of the entities inside the rectangle of cells (end exclusive).
+        """
+        key_x_start, key_y_start = self.bucket_key(x_start, y_start)
+        key_x_end, key_y_end = self.bucket_key(x_end - 1, y_end - 1)
+        buckets = self.buckets
+        for key_y in range(key_y_start, key_y_end + 1):
+            for key_x in range(key_x_start, key_x_end + 1):
+                bucket = buckets.get((key_x, key_y))
+                if not bucket:
+                    continue
+                for entity, (x, y) in bucket.items():
+                    if x_start <= x < x_end and y_start <= y < y_end:
+                        yield entity, (x, y)
+
+    def near(self, x: int, y: int, radius: int) -> Iterator[tuple[Hashable, tuple[int, int]]]:
+        """
+        Yields (entity, position) of the entities within radius cells (in both directions, a square).
+        """
+        return self.in_rect(x - radius, y - radius, x + radius + 1, y + radius + 1)
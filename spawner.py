@@ -0,0 +1,54 @@
+# Standard library imports
+import random
+from bisect import bisect
+from itertools import accumulate
+
+# Local folder imports
+from character import Enemy, EnemyTemplate, goblin, rat, slime, spider
+from tile import Tile
+
+
+# ------------ class setup ------------
+class SpawnTable:
+    """
+    Weighted enemy templates per terrain.
+    Tiles without an entry use the default weights, tiles with an empty entry never spawn enemies.
+    """
+    def __init__(self,
+                 default: list[tuple[EnemyTemplate, int]],
+                 per_tile: dict[str, list[tuple[EnemyTemplate, int]]] | None = None,
+                 ) -> None:
+        self.default = self.build(default)
+        self.per_tile = {name: self.build(weights) for name, weights in (per_tile or {}).items()}
+
+    @staticmethod
+    def build(weights: list[tuple[EnemyTemplate, int]]) -> tuple[list[EnemyTemplate], list[int]]:
+        templates = [template for template, _ in weights]
+        cumulative_weights = list(accumulate(weight for _, weight in weights))
+        return templates, cumulative_weights
+
+    def allows(self, tile: Tile) -> bool:
+        """
+        Returns whether enemies can live on the tile (e.g. not on water).
+        """
+        return bool(self.per_tile.get(tile.name, self.default)[0])
+
+    def spawn(self, tile: Tile, rng: random.Random = random) -> Enemy | None:
+        templates, cumulative_weights = self.per_tile.get(tile.name, self.default)
+        if not templates:
+            return None
+        index = bisect(cumulative_weights, rng.random() * cumulative_weights[-1])
+        return templates[index].spawn()
+
+
+# ------------ object creation ------------
+spawn_table = SpawnTable(
+    default=[(slime, 1), (goblin, 1), (spider, 1), (rat, 1)],
+    per_tile={
+        "water": [],
+        "forest": [(spider, 3), (rat, 2), (slime, 1), (goblin, 1)],
+        "pines": [(spider, 2), (goblin, 2), (rat, 1)],
+        "mountain": [(goblin, 3), (rat, 1)],
+        "town": [(rat, 4), (goblin, 1)],
+    }
+)
@@ -0,0 +1,29 @@
+# Local folder imports
+from character import Player
+from engine import ATTACK, BLOCKED, DIRECTIONS, MOVED, new_game_state, step
+from headless import play, ScriptedAgent
+from map import Map
+from rng import RngStreams
+
+
+def new_state(seed: int = 1):
+    return new_game_state(Map(30, 15, seed=seed), Player(), RngStreams(seed), spawn_chance=0)
+
+
+def test_blocked_actions_take_no_turn():
+    state = new_state()
+    blocked = [direction for direction in DIRECTIONS if not state.player.movement_options.get(direction)]
+    for action in blocked + [ATTACK, "jump"]:
+        _, events = step(state, action)
+        assert [event.kind for event in events] == [BLOCKED]
+    assert state.turn == 0
+
+    open_direction = next(direction for direction in DIRECTIONS if state.player.movement_options.get(direction))
+    _, events = step(state, open_direction)
+    assert events[0].kind == MOVED
+    assert state.turn == 1
+
+
+def test_agent_stuck_on_blocked_actions_stops():
+    state = play(new_state(), ScriptedAgent(["jump"]), max_turns=500)
+    assert state.turn == 0
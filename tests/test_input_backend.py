@@ -0,0 +1,35 @@
+# Third-party imports
+import pytest
+
+# Local folder imports
+from game import AsciiMode
+from input_backend import ScriptedInput
+
+
+def test_scripted_input_plays_keys_then_ends():
+    keys = ScriptedInput(["w", "\n"])
+    assert keys.poll() == "w"
+    assert keys.poll(None) == "\n"
+    with pytest.raises(EOFError):
+        keys.poll()
+
+
+def test_ascii_mode_runs_on_scripted_keys():
+    game = AsciiMode(seed=1, input_backend=ScriptedInput(["d", "s", "d", "s"] + [""] * 40))
+    start = list(game.player.pos)
+    with pytest.raises(EOFError):
+        game.run()
+    assert game.state.turn > 0
+    assert game.player.pos != start or game.player.health <= 0
+
+
+def test_ascii_combat_draws_the_enemy_that_stepped_in():
+    # ----- with seed 1, a roaming rat steps onto the player in the turn the goblin dies
+    game = AsciiMode(seed=1, input_backend=ScriptedInput(["d", "s", "d", "s", "d", "d", "s"] + [""] * 60))
+    drawn = []
+    game.display_ascii = lambda enemy=None, messages=(): drawn.append((enemy, game.state.enemy))
+    with pytest.raises(EOFError):
+        game.run()
+    assert all(enemy is in_combat for enemy, in_combat in drawn if enemy)
+    names = [enemy.name for enemy, _ in drawn if enemy]
+    assert names[0] != names[-1]
@@ -0,0 +1,25 @@
+# Local folder imports
+from character import Player
+from engine import new_game_state
+from headless import play, RandomAgent
+from map import Map
+from rng import RngStreams
+from world import World
+
+
+def test_dirty_cells_are_only_collected_for_a_renderer():
+    rng = RngStreams(1)
+    state = new_game_state(World(30, 15, seed=1), Player(health=10_000), rng, spawn_chance=0)
+    play(state, RandomAgent(rng.stream("agent")), max_turns=2000)
+    assert state.game_map.dirty_cells is None
+    assert state.game_map.pop_dirty_cells() == set()
+
+
+def test_tracked_dirty_cells_are_emptied_by_pop():
+    game_map, player = Map(30, 15, seed=1), Player()
+    game_map.track_dirty_cells()
+    game_map.update_map(player.pos, player.marker)
+    dirty_cells = game_map.pop_dirty_cells()
+    assert tuple(player.pos) in dirty_cells
+    assert all(game_map.is_explored(x, y) for x, y in dirty_cells)
+    assert game_map.pop_dirty_cells() == set()
@@ -0,0 +1,79 @@
+# Standard library imports
+from random import Random
+
+# Local folder imports
+from map import Map
+from pathfinding import MOVE_COSTS, Pathfinder
+from tile import mountain, plains, water
+
+
+def path_cost(game_map: Map, path: list[tuple[int, int]]) -> int:
+    # ----- the start is not entered, every further cell costs entering it
+    return sum(MOVE_COSTS.get(game_map.terrain_at(x, y).name, 1) for x, y in path[1:])
+
+
+def test_path_cost_equals_the_distance_of_the_field():
+    game_map = Map(60, 30, seed=4)
+    pathfinder = Pathfinder(game_map)
+    bounds = (0, 0, game_map.width, game_map.height)
+    rng = Random(4)
+    open_cells = [(x, y) for y in range(game_map.height) for x in range(game_map.width)
+                  if MOVE_COSTS.get(game_map.terrain_at(x, y).name, 1)]
+    for _ in range(30):
+        start, goal = rng.sample(open_cells, 2)
+        field = pathfinder.distance_field([goal], bounds)
+        path = pathfinder.find_path(start, goal, margin=max(game_map.width, game_map.height))
+        if path is None:
+            assert field.distance(*start) is None
+            continue
+        assert path[0] == start and path[-1] == goal
+        assert all(abs(x - next_x) + abs(y - next_y) == 1 for (x, y), (next_x, next_y) in zip(path, path[1:]))
+        assert path_cost(game_map, path) == field.distance(*start)
+        # ----- following the field down to the goal costs the same
+        assert path_cost(game_map, field.path(*start)) == field.distance(*start)
+
+
+def test_water_is_refused_as_a_goal():
+    game_map = Map(10, 5, seed=1, generate=False)
+    game_map.set_terrain(7, 2, water)
+    pathfinder = Pathfinder(game_map)
+    assert pathfinder.find_path((1, 2), (7, 2)) is None
+    assert pathfinder.distance_field([(7, 2)], (0, 0, 10, 5)).distance(1, 2) is None
+
+
+def test_paths_go_around_mountains_which_cost_more():
+    game_map = Map(10, 5, seed=1, generate=False)
+    pathfinder = Pathfinder(game_map)
+    assert pathfinder.find_path((1, 2), (8, 2)) == [(x, 2) for x in range(1, 9)]
+
+    # ----- a mountain on the straight way is worth a detour of 2 cells
+    game_map.set_terrain(4, 2, mountain)
+    path = pathfinder.find_path((1, 2), (8, 2))
+    assert (4, 2) not in path
+    assert path_cost(game_map, path) == 9
+    # ----- but not a detour of 6 (a wall with only the mountain to cross)
+    for y in range(5):
+        if y != 2:
+            game_map.set_terrain(4, y, water)
+    path = pathfinder.find_path((1, 2), (8, 2))
+    assert (4, 2) in path
+    assert path_cost(game_map, path) == 7 - 1 + MOVE_COSTS["mountain"]
+
+
+def test_caches_are_dropped_once_the_terrain_changes():
+    game_map = Map(10, 5, seed=1, generate=False)
+    pathfinder = Pathfinder(game_map)
+    bounds = (0, 0, 10, 5)
+    field = pathfinder.distance_field([(8, 2)], bounds)
+    assert pathfinder.distance_field([(8, 2)], bounds) is field
+    assert field.distance(1, 2) == 7
+    assert pathfinder.cost_grids and pathfinder.fields
+
+    game_map.set_terrain(4, 2, mountain)
+    # ----- the old field and cost grid are gone, the new ones see the mountain
+    new_field = pathfinder.distance_field([(8, 2)], bounds)
+    assert new_field is not field
+    assert new_field.distance(1, 2) == 9
+    assert len(pathfinder.fields) == 1
+    assert pathfinder.cost_grid(bounds)[2 * 10 + 4] == MOVE_COSTS["mountain"]
+    assert (4, 2) not in pathfinder.find_path((1, 2), (8, 2))
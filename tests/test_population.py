@@ -0,0 +1,29 @@
+# Standard library imports
+from random import Random
+
+# Local folder imports
+from map import Map
+from population import EnemyPopulation
+from spawner import spawn_table
+from world import World
+
+
+def test_entering_after_a_step_finds_the_same_enemies_as_a_full_query():
+    for game_map in (Map(120, 60, seed=2), World(30, 15, seed=2)):
+        population = EnemyPopulation(game_map, spawn_table, 2, Random(2), density=1 / 5, activity_radius=6)
+        rng, pos = Random(3), [20, 20]
+        population.activate(pos)
+        population.entering(pos)
+        for _ in range(200):
+            step_x, step_y = rng.choice([(0, -1), (0, 1), (-1, 0), (1, 0)])
+            new_pos = [pos[0] + step_x, pos[1] + step_y]
+            if not game_map.in_bounds(*new_pos):
+                continue
+            population.activate(new_pos)
+            before = {enemy for enemy, _ in population.index.near(*pos, population.activity_radius)}
+            after = {enemy for enemy, _ in population.index.near(*new_pos, population.activity_radius)}
+            entered = population.entering(new_pos)
+            assert len(entered) == len(set(entered))
+            assert set(entered) == after - before
+            pos = new_pos
+        assert len(population) > 0
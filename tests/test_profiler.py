@@ -0,0 +1,49 @@
+# Standard library imports
+import os
+from time import perf_counter, sleep
+
+# Third-party imports
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+# Local folder imports
+from engine import DIRECTIONS
+from profiler import FrameProfiler
+from pygame_mode import CombinedMode, PygameMode
+
+
+def test_nested_phase_only_counts_for_the_inner_phase():
+    profiler = FrameProfiler()
+    start = perf_counter()
+    with profiler.phase("events"):
+        sleep(0.01)
+        with profiler.phase("step"):
+            sleep(0.02)
+    elapsed = perf_counter() - start
+
+    events, step = profiler.phases["events"].durations[-1], profiler.phases["step"].durations[-1]
+    assert 0.01 <= events < 0.02 <= step
+    assert events + step <= elapsed
+
+
+@pytest.mark.parametrize("mode", [PygameMode, CombinedMode])
+def test_phases_of_a_frame_add_up_to_no_more_than_the_frame(mode):
+    game = mode(seed=1, redraw_on_change=False)
+    game.player.health = game.player.health_max = 10_000
+    keys = {direction: key for key, direction in game.movement_keys.items()}
+    for _ in range(20):
+        game.profiler = FrameProfiler()
+        if game.state.enemy:
+            key = pygame.K_RETURN
+        else:
+            key = keys[next(direction for direction in DIRECTIONS if game.player.movement_options.get(direction))]
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode="", mod=0, scancode=0))
+        start = perf_counter()
+        game.profile_events()
+        game.render()
+        elapsed = perf_counter() - start
+
+        assert game.profiler.phases["step"].durations
+        assert sum(sum(phase.durations) for phase in game.profiler.phases.values()) <= elapsed
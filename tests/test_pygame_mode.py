@@ -0,0 +1,43 @@
+# Standard library imports
+import os
+
+# Third-party imports
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+# Local folder imports
+from pygame_mode import CombinedMode, PygameMode
+from replay import play_back, record_session, replay_headless
+
+
+def post_key(key: int) -> None:
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode="", mod=0, scancode=0))
+
+
+@pytest.mark.parametrize("mode", [PygameMode, CombinedMode])
+def test_game_over_screen_only_quits_on_escape(mode):
+    game = mode(seed=1)
+    game.player.health = 0
+    post_key(pygame.K_RETURN)
+    game.check_events()
+    game.render()
+
+    post_key(pygame.K_ESCAPE)
+    with pytest.raises(SystemExit):
+        game.check_events()
+
+
+@pytest.mark.parametrize("event", [pygame.event.Event(pygame.QUIT),
+                                   pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, unicode="", mod=0, scancode=0)])
+def test_rendered_replay_stops_on_quit_or_escape(event):
+    recording = record_session(seed=2, max_turns=200, health=1000)
+    game = PygameMode(seed=recording.seed)
+    pygame.event.clear()
+    pygame.event.post(event)
+    play_back(game, recording, speed=1e9)
+    assert game.state.turn == 0
+
+    play_back(game, recording, speed=1e9)
+    assert game.state.turn == replay_headless(recording).turn
@@ -0,0 +1,41 @@
+# Standard library imports
+import json
+
+# Third-party imports
+import pytest
+
+# Local folder imports
+from game import AsciiMode
+from input_backend import ScriptedInput
+from replay import play_back, record_session, Recording, replay_headless, RULES_VERSION
+from snapshot import dumps
+
+
+@pytest.mark.parametrize("roaming", [False, True])
+def test_rendered_replay_ends_like_headless_replay(roaming):
+    recording = record_session(seed=2, max_turns=400, map_w=40, map_h=20, health=1000, spawn_chance=15,
+                               roaming=roaming)
+    game = AsciiMode(recording.map_w, recording.map_h, seed=recording.seed, input_backend=ScriptedInput([]))
+    play_back(game, recording, speed=1e9)
+
+    state = replay_headless(recording)
+    assert (game.state.population is not None) == roaming
+    assert game.player.health == state.player.health
+    assert (game.state.turn, game.state.kills) == (state.turn, state.kills)
+    assert dumps(game.state) == dumps(state)
+
+
+def test_recordings_of_other_rules_are_refused_or_warned_about(tmp_path):
+    path = tmp_path / "recording.json"
+    record_session(seed=1, max_turns=20).save(path)
+    assert Recording.load(path).version == RULES_VERSION
+
+    data = json.loads(path.read_text())
+    del data["version"]
+    path.write_text(json.dumps(data))
+    with pytest.warns(UserWarning, match="version 1"):
+        assert Recording.load(path).version == 1
+
+    path.write_text(json.dumps(dict(data, version=RULES_VERSION + 1)))
+    with pytest.raises(ValueError):
+        Recording.load(path)
@@ -0,0 +1,82 @@
+# Local folder imports
+from character import Enemy, Player
+from engine import ATTACK, ATTACKED, new_game_state, step
+from map import Map
+from rng import RngStreams
+from scheduler import TurnScheduler
+from weapon import claws, fists, iron_sword, short_bow
+
+
+def test_actors_due_at_the_same_time_act_in_the_order_they_were_scheduled():
+    scheduler = TurnScheduler()
+    for actor in "abc":
+        scheduler.schedule(actor, 10)
+    scheduler.schedule("d", 5)
+    assert [scheduler.pop() for _ in range(4)] == ["d", "a", "b", "c"]
+    assert scheduler.time == 10
+    assert scheduler.pop() is None
+
+
+def test_removed_actors_are_skipped():
+    scheduler = TurnScheduler()
+    for delay, actor in enumerate("abc"):
+        scheduler.schedule(actor, delay)
+    scheduler.remove("a")
+    scheduler.remove("a")
+    assert "a" not in scheduler and len(scheduler) == 2
+    # ----- the entry stays in the heap until it comes up
+    assert len(scheduler.heap) == 3
+    assert scheduler.pop() == "b"
+    assert scheduler.pop() == "c"
+    assert not scheduler.heap
+
+
+def test_scheduling_again_replaces_the_earlier_time():
+    scheduler = TurnScheduler()
+    scheduler.schedule("a", 5)
+    scheduler.schedule("b", 10)
+    scheduler.schedule("a", 20)
+    assert len(scheduler) == 2
+    assert scheduler.queue() == [(10, "b"), (20, "a")]
+    assert [scheduler.pop(), scheduler.pop(), scheduler.pop()] == ["b", "a", None]
+
+
+def test_queue_lists_the_actors_in_the_order_they_act():
+    scheduler = TurnScheduler()
+    for actor, delay in [("a", 30), ("b", 10), ("c", 30), ("d", 20), ("e", 10)]:
+        scheduler.schedule(actor, delay)
+    scheduler.remove("d")
+    queue = scheduler.queue()
+    assert queue == [(10, "b"), (10, "e"), (30, "a"), (30, "c")]
+    assert [scheduler.pop() for _ in queue] == [actor for _, actor in queue]
+
+
+def enemy_attacks(enemy: Enemy, weapon, player_attacks: int = 60) -> int:
+    """
+    Returns how often the enemy attacked while the player attacked the given number of times.
+    """
+    player = Player(health=100_000)
+    player.weapon = weapon
+    state = new_game_state(Map(30, 15, seed=1), player, RngStreams(1), spawn_chance=0)
+    state.enemy = enemy
+    state.scheduler.schedule(enemy)
+    attacks = 0
+    for _ in range(player_attacks):
+        _, events = step(state, ATTACK)
+        attacks += sum(event.kind == ATTACKED and event.actor == enemy.name for event in events)
+    return attacks
+
+
+def test_speed_changes_how_often_an_enemy_acts():
+    slow, normal, fast = (enemy_attacks(Enemy("Dummy", 100_000, claws, speed), iron_sword) for speed in (50, 100, 200))
+    assert abs(normal - 60) <= 1
+    assert abs(slow - 30) <= 1
+    assert abs(fast - 120) <= 1
+
+
+def test_attack_cost_changes_how_often_an_actor_acts():
+    # ----- a bow (120) is slower than claws (100), fists (80) are faster than a sword (100)
+    assert enemy_attacks(Enemy("Dummy", 100_000, short_bow), iron_sword) < enemy_attacks(
+        Enemy("Dummy", 100_000, claws), iron_sword)
+    assert enemy_attacks(Enemy("Dummy", 100_000, claws), fists) < enemy_attacks(
+        Enemy("Dummy", 100_000, claws), iron_sword)
@@ -0,0 +1,83 @@
+# Standard library imports
+from random import Random
+
+# Local folder imports
+from client import MapMirror
+from engine import ATTACK, DIRECTIONS
+from map import Map
+from protocol import decode, SYNC
+from server import GameServer, Session
+
+
+def receive(session: Session, mirror: MapMirror) -> list[dict]:
+    """
+    Applies the pending messages of the session to the mirror, like a client reading all of them.
+    """
+    messages = [decode(line) for line in session.outbox]
+    session.outbox.clear()
+    for message in messages:
+        mirror.apply(message)
+    return messages
+
+
+def play_ticks(server: GameServer, rng: Random, ticks: int, mirrors: dict[int, MapMirror]) -> None:
+    for _ in range(ticks):
+        for session in server.sessions.values():
+            session.command(ATTACK if session.state.enemy else rng.choice(list(DIRECTIONS)))
+        server.update()
+        for player_id, mirror in mirrors.items():
+            receive(server.sessions[player_id], mirror)
+
+
+def assert_mirrors_match(server: GameServer, mirrors: dict[int, MapMirror]) -> None:
+    game_map = server.game_map
+    cells = [(x, y) for y in range(game_map.height) for x in range(game_map.width)]
+    explored = {cell for cell in cells if game_map.is_explored(*cell)}
+    for player_id, mirror in mirrors.items():
+        mirror_map = mirror.state.game_map
+        assert {cell for cell in cells if mirror_map.is_explored(*cell)} == explored
+        assert all(mirror_map.terrain_at(*cell) is game_map.terrain_at(*cell) for cell in explored)
+        assert mirror.state.player.pos == server.sessions[player_id].state.player.pos
+        assert mirror.state.player.health == server.sessions[player_id].state.player.health
+        assert mirror.others == {str(other_id): tuple(session.state.player.pos)
+                                 for other_id, session in server.sessions.items() if other_id != player_id}
+
+
+def test_mirrors_follow_the_deltas_of_the_server():
+    server = GameServer(Map(60, 30, seed=1))
+    sessions = [server.join() for _ in range(3)]
+    mirrors = {session.player_id: MapMirror() for session in sessions}
+    rng = Random(1)
+
+    server.update()
+    for session in sessions:
+        messages = receive(session, mirrors[session.player_id])
+        assert messages[0]["type"] == SYNC
+    play_ticks(server, rng, 50, mirrors)
+    assert_mirrors_match(server, mirrors)
+
+    # ----- the others learn who left in the next delta
+    server.leave(sessions[0])
+    del mirrors[sessions[0].player_id]
+    play_ticks(server, rng, 1, mirrors)
+    assert_mirrors_match(server, mirrors)
+    assert all(str(sessions[0].player_id) not in mirror.others for mirror in mirrors.values())
+
+
+def test_an_overflowing_outbox_is_replaced_by_a_sync():
+    server = GameServer(Map(60, 30, seed=2))
+    sessions = [server.join() for _ in range(2)]
+    stalled = sessions[1]
+    mirrors = {sessions[0].player_id: MapMirror()}
+    stalled_mirror = MapMirror()
+
+    # ----- the stalled client doesn't read, while the other player keeps moving
+    play_ticks(server, Random(2), stalled.max_messages + 10, mirrors)
+    assert len(stalled.outbox) <= stalled.max_messages
+    messages = receive(stalled, stalled_mirror)
+    assert messages[0]["type"] == SYNC and messages[0]["tick"] > 1
+    assert all(message["type"] != SYNC for message in messages[1:])
+
+    mirrors[stalled.player_id] = stalled_mirror
+    play_ticks(server, Random(3), 10, mirrors)
+    assert_mirrors_match(server, mirrors)
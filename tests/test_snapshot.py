@@ -0,0 +1,40 @@
+# Third-party imports
+import pytest
+
+# Local folder imports
+from character import Player
+from engine import new_game_state
+from headless import play, RandomAgent
+from map import Map
+from rng import RngStreams
+from snapshot import dumps, loads
+from world import World
+
+
+@pytest.mark.parametrize("endless", [False, True])
+def test_snapshot_round_trip(endless):
+    game_map = World(30, 15, seed=3, sight_radius=3) if endless else Map(30, 15, seed=3, sight_radius=3)
+    rng = RngStreams(3)
+    state = play(new_game_state(game_map, Player(health=500), rng, roaming=True), RandomAgent(rng.stream("agent")),
+                 max_turns=60)
+
+    restored = loads(dumps(state))
+    assert type(restored.game_map) is type(game_map)
+    assert restored.game_map.fov.radius == 3
+    assert restored.player.pos == state.player.pos
+    assert restored.player.health == state.player.health
+    assert (restored.turn, restored.kills) == (state.turn, state.kills)
+    assert dumps(restored) == dumps(state)
+
+
+@pytest.mark.parametrize("roaming", [False, True])
+def test_snapshot_round_trip_after_the_player_died(roaming):
+    rng = RngStreams(1)
+    state = play(new_game_state(Map(30, 15, seed=1), Player(), rng, roaming=roaming),
+                 RandomAgent(rng.stream("agent")), max_turns=5000)
+    assert state.player.health <= 0
+
+    restored = loads(dumps(state))
+    assert restored.enemy is None
+    assert restored.player.health == state.player.health
+    assert dumps(restored) == dumps(state)
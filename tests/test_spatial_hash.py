@@ -0,0 +1,45 @@
+# Standard library imports
+from random import Random
+
+# Local folder imports
+from spatial_hash import SpatialHash
+
+
+def brute_force_rect(positions: dict, x_start: int, y_start: int, x_end: int, y_end: int) -> set:
+    return {entity for entity, (x, y) in positions.items() if x_start <= x < x_end and y_start <= y < y_end}
+
+
+def test_insert_and_move_across_buckets():
+    index = SpatialHash(bucket_size=4)
+    index.insert("a", 3, 3)
+    index.insert("b", 3, 3)
+    assert sorted(index.at(3, 3)) == ["a", "b"]
+
+    index.move("a", 4, 3)  # into the next bucket
+    assert index.at(3, 3) == ["b"] and index.at(4, 3) == ["a"]
+    index.insert("b", -1, -1)  # inserting again moves, into a negative bucket
+    assert index.at(3, 3) == [] and index.at(-1, -1) == ["b"]
+    assert (0, 0) not in index.buckets  # emptied buckets are dropped
+    assert len(index) == 2
+
+    index.remove("a")
+    assert "a" not in index and index.at(4, 3) == []
+    assert list(index.buckets) == [(-1, -1)]
+
+
+def test_in_rect_and_near_match_a_scan_at_bucket_borders_and_negative_coordinates():
+    rng = Random(1)
+    index = SpatialHash(bucket_size=8)
+    for entity in range(500):
+        index.insert(entity, rng.randrange(-40, 40), rng.randrange(-40, 40))
+    for entity in range(0, 500, 3):
+        index.move(entity, rng.randrange(-40, 40), rng.randrange(-40, 40))
+
+    # ----- rectangles starting and ending right on, before and after the bucket borders
+    for x_start, y_start, x_end, y_end in [(-8, -8, 0, 0), (-9, -7, 1, 9), (7, 8, 16, 17), (-40, -40, 40, 40),
+                                           (-1, -1, 0, 0), (0, 0, 1, 1), (-17, 3, -15, 30)]:
+        found = [entity for entity, _ in index.in_rect(x_start, y_start, x_end, y_end)]
+        assert len(found) == len(set(found))
+        assert set(found) == brute_force_rect(index.positions, x_start, y_start, x_end, y_end)
+
+    assert {entity for entity, _ in index.near(-8, 8, 5)} == brute_force_rect(index.positions, -13, 3, -2, 14)
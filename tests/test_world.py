@@ -0,0 +1,28 @@
+# Local folder imports
+from tile import plains
+from world import World
+
+
+def non_plains_share(world: World, cells) -> float:
+    cells = list(cells)
+    return sum(world.terrain_at(x, y) is not plains for x, y in cells) / len(cells)
+
+
+def test_chunk_edges_look_like_the_rest_of_the_world():
+    world = World(30, 15, seed=5)
+    size = world.chunk_size
+    chunks = [(chunk_x, chunk_y) for chunk_y in range(-5, 5) for chunk_x in range(-5, 5)]
+    edges = [(chunk_x * size + offset, chunk_y * size) for chunk_x, chunk_y in chunks for offset in range(size)]
+    edges += [(chunk_x * size, chunk_y * size + offset) for chunk_x, chunk_y in chunks for offset in range(size)]
+    inside = [(chunk_x * size + size // 2, chunk_y * size + offset) for chunk_x, chunk_y in chunks
+              for offset in range(size)]
+
+    inside_share = non_plains_share(world, inside)
+    assert inside_share > 0
+    assert non_plains_share(world, edges) > inside_share / 2
+
+
+def test_terrain_doesnt_depend_on_the_order_chunks_are_generated_in():
+    cells = [(x, y) for y in range(-40, 40, 3) for x in range(-40, 40, 3)]
+    forwards, backwards = World(30, 15, seed=5, max_chunks=1), World(30, 15, seed=5, max_chunks=1)
+    assert [forwards.terrain_at(x, y) for x, y in cells] == [backwards.terrain_at(x, y) for x, y in cells[::-1]][::-1]
@@ -0,0 +1,48 @@
+# Standard library imports
+from collections import OrderedDict
+
+# Third-party imports
+import pygame
+
+
+# ------------ class setup ------------
+class FontRegistry:
+    def __init__(self) -> None:
+        self.fonts: dict[tuple[str, int], pygame.font.Font] = {}
+
+    def get(self, path: str, size: int) -> pygame.font.Font:
+        key = (path, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.Font(path, size)
+        return self.fonts[key]
+
+
+# ------------ class setup ------------
+class TextCache:
+    def __init__(self, font_path: str = "font.ttf", max_size: int = 128) -> None:
+        self.font_path = font_path
+        self.max_size = max_size
+        self.fonts = FontRegistry()
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text: str, size: int, color) -> pygame.Surface:
+        """
+        Returns the rendered surface of the text, rendering it only if it's not cached yet.
+        The least recently used surface is dropped once the cache is full.
+        """
+        key = (text, size, color if isinstance(color, str) else tuple(color))
+        if key in self.surfaces:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return self.surfaces[key]
+
+        self.misses += 1
+        font = self.fonts.get(self.font_path, size)
+        surface = font.render(text, True, color).convert_alpha()
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
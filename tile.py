@@ -1,32 +1,35 @@
-# Standard library imports
-import os
-
-# Third-party imports
-import pygame
-
 # Local folder imports
 from color import Color as c
 
 
 class Tile:
-    def __init__(self, symbol: str, name: str, color: str = c.ANSI_RESET) -> None:
+    # every tile gets an ID, which is its index here, so grids can store tiles as single bytes
+    palette: list["Tile"] = []
+    blocking_ids: set[int] = set()
+
+    def __init__(self, symbol: str, name: str, color: str = c.ANSI_RESET, blocks_sight: bool = False) -> None:
+        self.id = len(Tile.palette)
+        Tile.palette.append(self)
+
         self.symbol = symbol
         self.name = name
+        self.blocks_sight = blocks_sight
+        if blocks_sight:
+            Tile.blocking_ids.add(self.id)
         self.legend = f"{symbol} {name.upper()}"
 
         self.colored_symbol = f"{color}{symbol}{c.ANSI_RESET}"
         self.colored_name = f"{color}{name.upper()}{c.ANSI_RESET}"
         self.colored_legend = f"{self.colored_symbol} {self.colored_name}"
 
-    def load_image(self):
-        self.image = pygame.image.load(os.path.join("images", f"{self.name}.png")).convert_alpha()
-
 
 plains = Tile(".", "plains", c.ANSI_YELLOW)
 forest = Tile("8", "forest", c.ANSI_GREEN)
 pines = Tile("Y", "pines", c.ANSI_GREEN)
-mountain = Tile("A", "mountain")
+mountain = Tile("A", "mountain", blocks_sight=True)
 water = Tile("~", "water", c.ANSI_CYAN)
 player_marker = Tile("X", "player", c.ANSI_RED)
 empty = Tile(" ", "???")
 town = Tile("M", "town", c.ANSI_MAGENTA)
+enemy_marker = Tile("E", "enemy", c.ANSI_RED)
+ally_marker = Tile("P", "ally", c.ANSI_BLUE)
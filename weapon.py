@@ -1,5 +1,11 @@
+# time an attack takes at normal speed by the type of the weapon (moving takes 100, see engine.py)
+ATTACK_COSTS = {"blunt": 80, "sharp": 100, "ranged": 120}
+
+
 # ------------ class setup ------------
 class Weapon:
+    __slots__ = ("name", "weapon_type", "damage", "value")
+
     def __init__(self,
                  name: str,
                  weapon_type: str,
@@ -11,6 +17,10 @@ class Weapon:
         self.damage = damage
         self.value = value
 
+    @property
+    def attack_cost(self) -> int:
+        return ATTACK_COSTS.get(self.weapon_type, 100)
+
 
 # ------------ object creation ------------
 iron_sword = Weapon(name="Iron Sword",
@@ -37,3 +47,5 @@ jaws = Weapon(name="Jaws",
               weapon_type="sharp",
               damage=4,
               value=0)
+
+weapons = {weapon.name: weapon for weapon in (iron_sword, short_bow, fists, claws, jaws)}
@@ -0,0 +1,139 @@
+# Standard library imports
+from collections import OrderedDict
+from random import Random
+
+# Local folder imports
+from grid import ByteGrid, TileGrid
+from map import Map, place_patches, scaled_patch_table
+from rng import coordinate_seed
+from tile import Tile, plains
+
+
+# ------------ subclass setup ------------
+class World(Map):
+    """
+    An endless map, generated chunk by chunk on first access.
+    The terrain of a chunk only depends on the seed and the chunk's coordinates,
+    so the least recently used chunks are dropped and regenerated identically when needed again.
+    Only the exploration state of visited chunks (1 byte per cell) is kept for good.
+    Width and height are only the size of the window displayed when no other is given.
+    """
+    chunk_size: int = 32
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 seed: int | None = None,
+                 sight_radius: int = 2,
+                 max_chunks: int = 64,
+                 ) -> None:
+        self.seed = Random().getrandbits(32) if seed is None else seed
+        self.max_chunks = max_chunks
+        self.chunks: OrderedDict[tuple[int, int], TileGrid] = OrderedDict()
+        self.explored_chunks: dict[tuple[int, int], ByteGrid] = {}
+        self.chunk_patch_table = scaled_patch_table(self.chunk_size, self.chunk_size)
+
+        super().__init__(width, height, self.seed, sight_radius)
+
+    def generate_map(self) -> None:
+        pass  # chunks are generated on demand
+
+    def generate_patches(self) -> None:
+        pass  # chunks are generated on demand
+
+    def generate_chunk(self, chunk_x: int, chunk_y: int) -> TileGrid:
+        """
+        Every chunk starts its own patches, which may reach into the neighbouring chunks,
+        so the patches of the chunk and its 8 neighbours are placed on a canvas of 3x3 chunks
+        (tile after tile, like on a whole map), then the middle chunk is cut out.
+        Whichever chunk is generated, a cell always ends up covered by the same patches.
+        """
+        size = self.chunk_size
+        canvas = TileGrid(size * 3, size * 3, plains)
+        neighbours = [
+            ((offset_x + 1) * size, (offset_y + 1) * size,
+             Random(coordinate_seed(self.seed, chunk_x + offset_x, chunk_y + offset_y)))
+            for offset_y in (-1, 0, 1) for offset_x in (-1, 0, 1)
+        ]
+        for tile, num_patches, min_size, max_size in self.chunk_patch_table:
+            for area_x, area_y, rng in neighbours:
+                place_patches(canvas, rng, tile, num_patches, min_size, max_size, area=(area_x, area_y, size, size))
+
+        chunk = TileGrid(size, size, plains)
+        chunk.data = bytearray(b"".join(canvas.row(y, size, size * 2) for y in range(size, size * 2)))
+        return chunk
+
+    def get_chunk(self, chunk_x: int, chunk_y: int) -> TileGrid:
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.generate_chunk(chunk_x, chunk_y)
+            self.chunks[key] = chunk
+            if len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    # ----- cell access in world coordinates
+    def in_bounds(self, x: int, y: int) -> bool:
+        return True
+
+    def terrain_at(self, x: int, y: int) -> Tile:
+        chunk_x, local_x = divmod(x, self.chunk_size)
+        chunk_y, local_y = divmod(y, self.chunk_size)
+        return self.get_chunk(chunk_x, chunk_y).tile_at(local_x, local_y)
+
+    def terrain_row(self, y: int, x_start: int, x_end: int) -> bytearray:
+        chunk_y, local_y = divmod(y, self.chunk_size)
+        row = bytearray()
+        for chunk_x, local_start, local_end in self.split_row(x_start, x_end):
+            row += self.get_chunk(chunk_x, chunk_y).row(local_y, local_start, local_end)
+        return row
+
+    def is_explored(self, x: int, y: int) -> bool:
+        chunk_x, local_x = divmod(x, self.chunk_size)
+        chunk_y, local_y = divmod(y, self.chunk_size)
+        explored = self.explored_chunks.get((chunk_x, chunk_y))
+        return explored is not None and bool(explored[local_x, local_y])
+
+    def explored_row(self, y: int, x_start: int, x_end: int) -> bytearray:
+        chunk_y, local_y = divmod(y, self.chunk_size)
+        row = bytearray()
+        for chunk_x, local_start, local_end in self.split_row(x_start, x_end):
+            explored = self.explored_chunks.get((chunk_x, chunk_y))
+            if explored is None:
+                row += bytes(local_end - local_start)
+            else:
+                row += explored.row(local_y, local_start, local_end)
+        return row
+
+    def explore(self, x: int, y: int) -> bool:
+        chunk_x, local_x = divmod(x, self.chunk_size)
+        chunk_y, local_y = divmod(y, self.chunk_size)
+        explored = self.explored_chunks.get((chunk_x, chunk_y))
+        if explored is None:
+            explored = self.explored_chunks[chunk_x, chunk_y] = ByteGrid(self.chunk_size, self.chunk_size)
+        elif explored[local_x, local_y]:
+            return False
+        explored[local_x, local_y] = 1
+        return True
+
+    def split_row(self, x_start: int, x_end: int) -> list[tuple[int, int, int]]:
+        """
+        Splits a row segment into (chunk x, local start, local end) parts along the chunk borders.
+        """
+        parts = []
+        x = x_start
+        while x < x_end:
+            chunk_x, local_start = divmod(x, self.chunk_size)
+            local_end = min(self.chunk_size, local_start + x_end - x)
+            parts.append((chunk_x, local_start, local_end))
+            x += local_end - local_start
+        return parts
+
+    def clip(self, x_start: int, y_start: int, x_end: int, y_end: int) -> tuple[int, int, int, int]:
+        return x_start, y_start, x_end, y_end
+
+    def clamp_view(self, x: int, y: int, width: int, height: int) -> tuple[int, int]:
+        return x, y